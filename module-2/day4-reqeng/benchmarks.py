@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Benchmarks - Throughput of the formula stack on synthetic workbooks
+Measures scan (cells/s), parse (formulas/s), evaluation (cells/s), batch
+NPV/IRR (series/s) and forecast scenarios/s, and appends the results with
+the current git commit to a JSON history so regressions can be tracked.
+
+Usage:
+    python benchmarks.py                                # sizes 10^3, 10^4, 10^5
+    python benchmarks.py --sizes 1000000 --skip-scan    # engine only at 10^6
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import numpy as np
+
+from corporate_forecast_model import CorporateFinancialModel, FinancialData, run_forecast_batch
+from excel_analyzer import analyze_excel_formulas
+from excel_formula_utils import FinancialFormulas
+from formula_engine import FormulaEngine
+from synthetic_workbook import generate_workbook, synthetic_analysis
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench_scan(n_formulas: int) -> Dict:
+    """excel_analyzer throughput on a generated xlsx file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'synthetic.xlsx')
+        generate_workbook(path, n_formulas)
+        with contextlib.redirect_stdout(io.StringIO()):
+            analysis, seconds = _timed(analyze_excel_formulas, path)
+    cells = analysis['sheet_info']['rows'] * analysis['sheet_info']['columns']
+    return {'cells': cells, 'seconds': seconds, 'cells_per_second': cells / seconds}
+
+
+def bench_engine(n_formulas: int) -> Dict:
+    """Parse/compile and full evaluation throughput of the formula engine"""
+    analysis, inputs = synthetic_analysis(n_formulas)
+    engine, parse_seconds = _timed(FormulaEngine.from_analysis, analysis, inputs=inputs)
+    _, eval_seconds = _timed(engine.evaluate)
+    count = len(engine.formulas)
+    return {
+        'formulas': count,
+        'parse_seconds': parse_seconds,
+        'formulas_per_second': count / parse_seconds,
+        'evaluate_seconds': eval_seconds,
+        'cells_per_second': count / eval_seconds
+    }
+
+
+def bench_npv_irr(n_series: int = 100000, periods: int = 10) -> Dict:
+    """Batch NPV and IRR over random cash-flow series"""
+    rng = np.random.default_rng(42)
+    cash_flows = rng.uniform(10, 50, size=(n_series, periods))
+    cash_flows[:, 0] = -rng.uniform(100, 200, size=n_series)
+    _, npv_seconds = _timed(FinancialFormulas.npv_batch, 0.08, cash_flows)
+    _, irr_seconds = _timed(FinancialFormulas.irr_batch, cash_flows)
+    return {
+        'series': n_series,
+        'periods': periods,
+        'npv_series_per_second': n_series / npv_seconds,
+        'irr_series_per_second': n_series / irr_seconds
+    }
+
+
+def bench_forecast(n_scenarios: int = 2000) -> Dict:
+    """Forecast scenarios per second: one run_full_forecast per scenario vs run_forecast_batch"""
+    rng = np.random.default_rng(42)
+    scenarios = [FinancialData(revenue_2020=float(revenue))
+                 for revenue in rng.uniform(40000, 60000, size=n_scenarios)]
+    start = time.perf_counter()
+    for data in scenarios:
+        CorporateFinancialModel(data).run_full_forecast()
+    seconds = time.perf_counter() - start
+    _, batch_seconds = _timed(run_forecast_batch, scenarios)
+    return {
+        'scenarios': n_scenarios,
+        'scenarios_per_second': n_scenarios / seconds,
+        'batch_scenarios_per_second': n_scenarios / batch_seconds
+    }
+
+
+def git_commit() -> str:
+    """Current commit hash, or 'unknown' outside a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_benchmarks(sizes: List[int], skip_scan: bool = False) -> Dict:
+    """Run the full suite and return one history entry"""
+    results = {'engine': {}, 'scan': {}}
+    for n in sizes:
+        print(f"  engine @ {n:,} formulas ...")
+        results['engine'][str(n)] = bench_engine(n)
+        if not skip_scan:
+            print(f"  scan   @ {n:,} formulas ...")
+            results['scan'][str(n)] = bench_scan(n)
+    print("  npv/irr batch ...")
+    results['npv_irr'] = bench_npv_irr()
+    print("  forecast scenarios ...")
+    results['forecast'] = bench_forecast()
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'results': results
+    }
+
+
+def print_benchmark_summary(entry: Dict):
+    """Print one history entry as a table"""
+    results = entry['results']
+    print("=" * 70)
+    print(f"BENCHMARKS @ {entry['commit']} ({entry['timestamp']})")
+    print("=" * 70)
+    print(f"{'Formulas':>10} {'Parse/s':>14} {'Evaluate/s':>14} {'Scan cells/s':>14}")
+    print("-" * 70)
+    for size, engine in results['engine'].items():
+        scan = results['scan'].get(size, {}).get('cells_per_second')
+        scan_text = f"{scan:>14,.0f}" if scan else f"{'-':>14}"
+        print(f"{int(size):>10,} {engine['formulas_per_second']:>14,.0f} "
+              f"{engine['cells_per_second']:>14,.0f} {scan_text}")
+    print(f"\nNPV batch: {results['npv_irr']['npv_series_per_second']:,.0f} series/s")
+    print(f"IRR batch: {results['npv_irr']['irr_series_per_second']:,.0f} series/s")
+    print(f"Forecast:  {results['forecast']['scenarios_per_second']:,.0f} scenarios/s "
+          f"(batch: {results['forecast']['batch_scenarios_per_second']:,.0f} scenarios/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the formula stack")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="Synthetic workbook sizes in formulas")
+    parser.add_argument('--skip-scan', action='store_true',
+                        help="Skip xlsx generation and excel_analyzer scans")
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help="JSON history file the results are appended to")
+    args = parser.parse_args()
+
+    print("Running benchmarks...")
+    entry = run_benchmarks(args.sizes, args.skip_scan)
+    print_benchmark_summary(entry)
+
+    history = []
+    if os.path.exists(args.output):
+        with open(args.output) as f:
+            history = json.load(f)
+    history.append(entry)
+    with open(args.output, 'w') as f:
+        json.dump(history, f, indent=2)
+    print(f"\nResults appended to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,21 @@ This program recreates the financial forecasting calculations
 from the Excel sheet "Forecast" in Corporate Modelling_230421.xlsx
 """
 
+import argparse
 import math
 import json
 from typing import Dict, List, Union, Optional
 from dataclasses import dataclass
 from collections import defaultdict
 
+import numpy as np
+
+from formula_profiler import FormulaProfiler, no_profile
+
+
+# Forecast sheet column holding each forecast year (row 1 of the sheet)
+YEAR_COLUMNS = {2020: 'D', 2025: 'E', 2030: 'F', 2035: 'G', 2040: 'H', 2045: 'I', 2050: 'J'}
+
 
 @dataclass
 class FinancialData:
@@ -40,10 +49,11 @@ class CorporateFinancialModel:
     Pure Python implementation of Excel financial forecasting model
     """
     
-    def __init__(self, data: FinancialData):
+    def __init__(self, data: FinancialData, profiler: Optional[FormulaProfiler] = None):
         self.data = data
         self.calculations = {}
         self.iam_data = self._initialize_iam_data()
+        self.profiler = profiler
         
     def _initialize_iam_data(self):
         """
@@ -161,7 +171,22 @@ class CorporateFinancialModel:
     def run_full_forecast(self) -> Dict:
         """
         Run the complete financial forecast for all years
+        When a profiler is attached, every forecast cell is timed under its
+        Forecast sheet reference and the model's own methods are instrumented
+        (this forecast does not call ExcelFormulas; profile a FormulaEngine for that)
         """
+        if self.profiler is None:
+            return self._run_full_forecast(no_profile)
+        
+        with self.profiler.instrument(self), \
+                self.profiler.frame('run_full_forecast'):
+            return self._run_full_forecast(self.profiler.cell)
+    
+    def _cell_ref(self, row: int, year: int) -> str:
+        """Forecast sheet reference of a line item in a given year"""
+        return f"{YEAR_COLUMNS.get(year, str(year))}{row}"
+    
+    def _run_full_forecast(self, cell) -> Dict:
         results = {
             'years': self.data.years,
             'revenue_growth_rates': {},
@@ -172,14 +197,21 @@ class CorporateFinancialModel:
         }
         
         # Calculate key ratios (constant across years)
+        with cell('D9', 'simple_arithmetic'):
+            goodwill_and_intangible = self.calculate_goodwill_intangible()
+        with cell('E10', 'ratios'):
+            debt_to_equity_ratio = self.calculate_debt_to_equity_ratio()
+        with cell('D16', 'ratios'):
+            cost_of_sales_ratio = self.calculate_cost_of_sales_ratio()
         results['key_ratios'] = {
-            'goodwill_and_intangible': self.calculate_goodwill_intangible(),
-            'debt_to_equity_ratio': self.calculate_debt_to_equity_ratio(),
-            'cost_of_sales_ratio': self.calculate_cost_of_sales_ratio()
+            'goodwill_and_intangible': goodwill_and_intangible,
+            'debt_to_equity_ratio': debt_to_equity_ratio,
+            'cost_of_sales_ratio': cost_of_sales_ratio
         }
         
         # Calculate growth rates
-        growth_rates = self.calculate_revenue_growth_rates()
+        with cell('E15:J15', 'other'):
+            growth_rates = self.calculate_revenue_growth_rates()
         results['revenue_growth_rates'] = growth_rates
         
         # Forecast for each year
@@ -190,14 +222,16 @@ class CorporateFinancialModel:
                 results['cost_of_sales_forecast'][year] = self.data.cost_of_sales_2020
             else:
                 # Apply growth rate if available
-                if year in growth_rates:
-                    revenue = self.forecast_revenue(year, growth_rates[year], prev_revenue)
-                else:
-                    # Use previous year's revenue if no growth rate
-                    revenue = prev_revenue
+                with cell(self._cell_ref(32, year), 'ratios'):
+                    if year in growth_rates:
+                        revenue = self.forecast_revenue(year, growth_rates[year], prev_revenue)
+                    else:
+                        # Use previous year's revenue if no growth rate
+                        revenue = prev_revenue
                 
                 results['revenue_forecast'][year] = revenue
-                results['cost_of_sales_forecast'][year] = self.forecast_cost_of_sales(revenue)
+                with cell(self._cell_ref(33, year), 'simple_arithmetic'):
+                    results['cost_of_sales_forecast'][year] = self.forecast_cost_of_sales(revenue)
                 prev_revenue = revenue
         
         # Balance sheet calculations
@@ -238,8 +272,72 @@ class CorporateFinancialModel:
             print(f"{year:<6} ${revenue:<11,.0f} ${cost_of_sales:<14,.0f} ${gross_profit:<14,.0f} {margin:<7.1f}%")
 
 
+def run_forecast_batch(scenarios: List[FinancialData]) -> List[Dict]:
+    """
+    Run the forecast for many scenarios at once
+    Scenarios sharing a year grid are evaluated together as NumPy arrays
+    (one array operation per year instead of one model per scenario).
+    Returns the same result dictionaries as run_full_forecast, in input order.
+    """
+    groups = defaultdict(list)
+    for position, data in enumerate(scenarios):
+        groups[tuple(data.years)].append(position)
+    
+    results: List[Optional[Dict]] = [None] * len(scenarios)
+    for years, positions in groups.items():
+        batch = [scenarios[p] for p in positions]
+        template = CorporateFinancialModel(batch[0])
+        growth_rates = template.calculate_revenue_growth_rates()  # IAM-driven, same for all
+        
+        def column(field):
+            return np.array([getattr(data, field) for data in batch], dtype=float)
+        
+        revenue_2020, cost_2020 = column('revenue_2020'), column('cost_of_sales_2020')
+        debt, equity = column('non_current_debt'), column('shareholder_equity')
+        goodwill = column('goodwill_base') + column('intangible_assets_base')
+        debt_to_equity = np.divide(debt, equity, out=np.zeros_like(debt), where=equity != 0)
+        cost_ratio = np.divide(cost_2020, revenue_2020, out=np.zeros_like(cost_2020),
+                               where=revenue_2020 != 0)
+        
+        revenue_paths, cost_paths = {}, {}
+        prev_revenue = revenue_2020
+        for year in years:
+            if year == 2020:  # Base year
+                revenue_paths[year], cost_paths[year] = revenue_2020, cost_2020
+            else:
+                revenue = prev_revenue * (1 + growth_rates[year]) if year in growth_rates else prev_revenue
+                revenue_paths[year], cost_paths[year] = revenue, -cost_ratio * revenue
+                prev_revenue = revenue
+        
+        for i, position in enumerate(positions):
+            results[position] = {
+                'years': list(years),
+                'revenue_growth_rates': dict(growth_rates),
+                'revenue_forecast': {year: float(revenue_paths[year][i]) for year in years},
+                'cost_of_sales_forecast': {year: float(cost_paths[year][i]) for year in years},
+                'key_ratios': {
+                    'goodwill_and_intangible': float(goodwill[i]),
+                    'debt_to_equity_ratio': float(debt_to_equity[i]),
+                    'cost_of_sales_ratio': float(cost_ratio[i])
+                },
+                'balance_sheet': {
+                    year: {
+                        'non_current_debt_ratio': float(debt_to_equity[i]),
+                        'goodwill_intangible': float(goodwill[i])
+                    }
+                    for year in years
+                }
+            }
+    return results
+
+
 def main():
     """Main function to run the financial forecasting model"""
+    parser = argparse.ArgumentParser(description="Run the corporate financial forecast")
+    parser.add_argument('--xlsx', action='store_true',
+                        help="Also save forecast_results.xlsx in the Forecast sheet layout")
+    args = parser.parse_args()
+
     print("Corporate Financial Forecasting Model")
     print("Converted from Excel to Pure Python")
     print("=" * 50)
@@ -260,6 +358,14 @@ def main():
     
     print(f"\nDetailed results saved to 'forecast_results.json'")
     
+    if args.xlsx:
+        # Hand analysts the same results as a workbook in the Forecast sheet layout
+        from excel_exporter import export_forecast_results
+        with open('formula_analysis.json') as f:
+            analysis = json.load(f)
+        export_forecast_results(results, 'forecast_results.xlsx', analysis=analysis)
+        print("Forecast workbook saved to 'forecast_results.xlsx'")
+    
     print("\n" + "=" * 50)
     print("EXCEL FORMULA IMPLEMENTATIONS:")
     print("=" * 50)
@@ -10,32 +10,51 @@ import json
 import re
 
 
-def analyze_excel_formulas():
+def categorize_formula(f):
+    """Assign a formula string to one of the analysis categories"""
+    if '^(' in f and '/1/' in f and '-1' in f:
+        return 'growth_rates'
+    elif 'SUM(' in f:
+        return 'sums'
+    elif '/' in f and not '^(' in f and not 'SUM(' in f:
+        return 'ratios'
+    elif any(op in f for op in ['+', '-', '*']) and not any(func in f for func in ['SUM(', '^(']):
+        return 'simple_arithmetic'
+    elif f.startswith('=$'):
+        return 'references'
+    else:
+        return 'other'
+
+
+def analyze_excel_formulas(file_path="Corporate Modelling_230421.xlsx", sheet_name="Forecast"):
     """Analyze the Excel file and extract all formulas with their context"""
     
-    file_path = "Corporate Modelling_230421.xlsx"
     print(f"Loading Excel file: {file_path}")
     
-    # Load workbook with formulas preserved
-    wb = load_workbook(file_path, data_only=False)
-    ws = wb['Forecast']
+    # Load workbook with formulas preserved (read-only mode streams the rows)
+    wb = load_workbook(file_path, data_only=False, read_only=True)
+    ws = wb[sheet_name]
+    if ws.max_row is None:
+        # Files written by streaming writers may omit the dimension record
+        ws.calculate_dimension(force=True)
     
-    print(f"Forecast sheet dimensions: {ws.max_row} rows × {ws.max_column} columns\n")
+    print(f"{sheet_name} sheet dimensions: {ws.max_row} rows × {ws.max_column} columns\n")
     
     # Extract all formulas
     formulas = []
     data_values = {}
+    col_letters = [openpyxl.utils.get_column_letter(col) for col in range(1, ws.max_column + 1)]
     
-    for row in range(1, ws.max_row + 1):
-        for col in range(1, ws.max_column + 1):
-            cell = ws.cell(row=row, column=col)
-            col_letter = openpyxl.utils.get_column_letter(col)
+    for row, cells in enumerate(ws.iter_rows(min_row=1, max_row=ws.max_row,
+                                             max_col=ws.max_column), start=1):
+        # Get row label for context
+        row_label = cells[0].value or ""
+        row_label = str(row_label).strip() if row_label else f"Row{row}"
+        
+        for col, cell in enumerate(cells, start=1):
+            col_letter = col_letters[col - 1]
             cell_ref = f"{col_letter}{row}"
             
-            # Get row label for context
-            row_label = ws.cell(row=row, column=1).value or ""
-            row_label = str(row_label).strip() if row_label else f"Row{row}"
-            
             if cell.value is not None:
                 if isinstance(cell.value, str) and cell.value.startswith('='):
                     # It's a formula
@@ -65,29 +84,19 @@ def analyze_excel_formulas():
     }
     
     for formula in formulas:
-        f = formula['formula']
-        
-        if '^(' in f and '/1/' in f and '-1' in f:
-            categories['growth_rates'].append(formula)
-        elif 'SUM(' in f:
-            categories['sums'].append(formula)
-        elif '/' in f and not '^(' in f and not 'SUM(' in f:
-            categories['ratios'].append(formula)
-        elif any(op in f for op in ['+', '-', '*']) and not any(func in f for func in ['SUM(', '^(']):
-            categories['simple_arithmetic'].append(formula)
-        elif f.startswith('=$'):
-            categories['references'].append(formula)
-        else:
-            categories['other'].append(formula)
+        categories[categorize_formula(formula['formula'])].append(formula)
+    
+    sheet_info = {
+        'rows': ws.max_row,
+        'columns': ws.max_column
+    }
+    wb.close()
     
     return {
         'formulas': formulas,
         'data_values': data_values,
         'categories': categories,
-        'sheet_info': {
-            'rows': ws.max_row,
-            'columns': ws.max_column
-        }
+        'sheet_info': sheet_info
     }
 
 
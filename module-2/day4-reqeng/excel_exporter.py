@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Excel Exporter - Writes evaluated results back into an xlsx workbook
+Uses openpyxl's write-only (streaming) mode: rows are written in order and
+flushed to disk, so openpyxl builds no cell objects for the sheet. The
+values to write are still held in memory and sorted by position first.
+The Forecast sheet layout (cell positions, row labels, year headers) is kept.
+"""
+
+import json
+import re
+from functools import lru_cache
+from itertools import groupby
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils.cell import column_index_from_string
+
+from corporate_forecast_model import YEAR_COLUMNS
+from excel_formula_utils import ExcelError
+
+
+# Forecast sheet rows used for the run_full_forecast line items
+FORECAST_ROWS = {
+    'revenue_forecast': 32,
+    'cost_of_sales_forecast': 33,
+    'gross_profit': 34,
+}
+
+
+_CELL_RE = re.compile(r"\$?([A-Z]{1,3})\$?(\d+)")
+
+# Column letters repeat across rows, so their indexes are computed once
+_column_index = lru_cache(maxsize=None)(column_index_from_string)
+
+
+def _position(cell: str) -> Tuple[int, int]:
+    """'D12' -> (12, 4)"""
+    column, row = _CELL_RE.fullmatch(cell.upper()).groups()
+    return int(row), _column_index(column)
+
+
+def layout_cells(values: Dict[str, Any], analysis: Optional[Dict] = None) -> Iterable[Tuple[int, int, Any]]:
+    """
+    Merge evaluated values with the sheet's labels and data values
+    Yields (row, column, value) sorted by row, then column; evaluated values
+    win over the analysis data values at the same position.
+    """
+    cells = {}
+    if analysis is not None:
+        for cell, entry in analysis['data_values'].items():
+            cells[_position(cell)] = entry['value']
+    for cell, value in values.items():
+        if '!' in cell:  # Cells on other sheets (e.g. IAM inputs) are not exported
+            continue
+        cells[_position(cell)] = value
+    for (row, column) in sorted(cells):
+        yield row, column, cells[(row, column)]
+
+
+def write_sheet(ws, cells: Iterable[Tuple[int, int, Any]], as_text: bool = False):
+    """
+    Stream (row, column, value) triples, sorted by row then column, into a write-only sheet
+    Gaps are filled with empty cells so every value lands at its original position.
+    With as_text=True formula strings are stored as text instead of live formulas.
+    Error values (#DIV/0!) are written as Excel errors.
+    """
+    next_row = 1
+    for row, row_cells in groupby(cells, key=lambda item: item[0]):
+        while next_row < row:
+            ws.append([])
+            next_row += 1
+        line = []
+        for _, column, value in row_cells:
+            line.extend([None] * (column - 1 - len(line)))
+            if as_text and isinstance(value, str) and value.startswith('='):
+                text_cell = WriteOnlyCell(ws, value=value)
+                text_cell.data_type = 's'
+                value = text_cell
+            elif isinstance(value, ExcelError):
+                value = str(value)
+            line.append(value)
+        ws.append(line)
+        next_row = row + 1
+
+
+def export_evaluated_workbook(values: Dict[str, Any], path: str,
+                              analysis: Optional[Dict] = None,
+                              include_formulas: bool = False,
+                              sheet: str = 'Forecast'):
+    """
+    Write evaluated cell values (e.g. FormulaEngine.evaluate()) to an xlsx file
+    With include_formulas=True a second sheet holds the original formula text
+    at the same positions, next to the values.
+    """
+    wb = Workbook(write_only=True)
+    write_sheet(wb.create_sheet(sheet), layout_cells(values, analysis))
+
+    if include_formulas and analysis is not None:
+        formulas = {entry['cell']: entry['formula'] for entry in analysis['formulas']}
+        write_sheet(wb.create_sheet(f"{sheet} formulas"), layout_cells(formulas, analysis), as_text=True)
+
+    wb.save(path)
+
+
+def forecast_cells(results: Dict) -> Dict[str, Any]:
+    """
+    Map run_full_forecast() output onto Forecast sheet cells (years in row 1)
+    The sheet stores cost of sales as a negative amount (=-$D16*D$32), while
+    run_full_forecast() reports the 2020 base year as a positive cost, so it
+    is written as a negative amount and gross profit is revenue less cost.
+    """
+    cells = {}
+    for year in results['years']:
+        column = YEAR_COLUMNS.get(year)
+        if column is None:
+            continue
+        revenue = results['revenue_forecast'][year]
+        cost_of_sales = -abs(results['cost_of_sales_forecast'][year])
+        cells[f"{column}1"] = year
+        cells[f"{column}{FORECAST_ROWS['revenue_forecast']}"] = revenue
+        cells[f"{column}{FORECAST_ROWS['cost_of_sales_forecast']}"] = cost_of_sales
+        cells[f"{column}{FORECAST_ROWS['gross_profit']}"] = revenue + cost_of_sales
+    return cells
+
+
+def export_forecast_results(results: Dict, path: str, analysis: Optional[Dict] = None):
+    """
+    Write run_full_forecast() output to an xlsx file using the Forecast sheet layout
+    Row labels come from the formula analysis when given, else from the line item names
+    """
+    cells = forecast_cells(results)
+    if analysis is None:
+        labels = {'revenue_forecast': 'Revenue', 'cost_of_sales_forecast': 'Cost of sales',
+                  'gross_profit': 'Total gross profit'}
+        for item, row in FORECAST_ROWS.items():
+            cells[f"A{row}"] = labels[item]
+    export_evaluated_workbook(cells, path, analysis=analysis)
+
+
+if __name__ == "__main__":
+    from corporate_forecast_model import CorporateFinancialModel, FinancialData
+    from formula_engine import load_engine
+
+    with open('formula_analysis.json') as f:
+        analysis = json.load(f)
+
+    engine = load_engine()
+    values = engine.evaluate()
+    export_evaluated_workbook(values, 'forecast_evaluated.xlsx',
+                              analysis=analysis, include_formulas=True)
+    print("Evaluated Forecast sheet saved to 'forecast_evaluated.xlsx'")
+
+    # The exported forecast must match the sheet where both are defined (2020, column D)
+    cells = forecast_cells(CorporateFinancialModel(FinancialData()).run_full_forecast())
+    for row in FORECAST_ROWS.values():
+        cell = f"{YEAR_COLUMNS[2020]}{row}"
+        assert abs(cells[cell] - values[cell]) < 1e-6, f"{cell}: {cells[cell]} != {values[cell]}"
+    print("Forecast cells D32:D34 match the evaluated sheet: True")
@@ -5,7 +5,198 @@ This module provides pure Python equivalents of common Excel formulas
 """
 
 import math
-from typing import List, Union, Optional
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import List, Sequence, Union, Optional
+
+import numpy as np
+
+
+class ExcelError:
+    """
+    An Excel error value such as #DIV/0!
+    Like in Excel, arithmetic and comparisons involving an error give that
+    error, so it reaches every dependent cell instead of looking like a number.
+    In broadcast data tables an error element is NaN: an error combined with
+    a NumPy array gives an all-NaN array.
+    """
+    __slots__ = ('code',)
+    # NumPy defers to the operators below instead of building object arrays
+    __array_ufunc__ = None
+
+    def __init__(self, code: str):
+        self.code = code
+
+    def __repr__(self):
+        return self.code
+
+    __str__ = __repr__
+
+    def __format__(self, spec):
+        return self.code
+
+    def __eq__(self, other):
+        return isinstance(other, ExcelError) and other.code == self.code
+
+    def __hash__(self):
+        return hash(self.code)
+
+    def __reduce__(self):
+        return ExcelError, (self.code,)
+
+    def _propagate(self, other=None):
+        if isinstance(other, np.ndarray):
+            return np.full(other.shape, np.nan)
+        return self
+
+    __add__ = __radd__ = __sub__ = __rsub__ = _propagate
+    __mul__ = __rmul__ = __truediv__ = __rtruediv__ = __pow__ = __rpow__ = _propagate
+    __neg__ = __pos__ = __abs__ = _propagate
+    __lt__ = __le__ = __gt__ = __ge__ = _propagate
+
+
+DIV0 = ExcelError('#DIV/0!')
+NA = ExcelError('#N/A')
+REF = ExcelError('#REF!')
+VALUE = ExcelError('#VALUE!')
+
+
+def first_error(values):
+    """The first Excel error among values, or None"""
+    return next((value for value in values if isinstance(value, ExcelError)), None)
+
+
+def _nan_errors(*values):
+    """Values for an array branch: Excel errors become NaN"""
+    return [np.nan if isinstance(value, ExcelError) else value for value in values]
+
+
+def _type_rank(value) -> int:
+    """Excel orders numbers before text before logical values"""
+    if isinstance(value, (bool, np.bool_)):
+        return 2
+    return 1 if isinstance(value, str) else 0
+
+
+def _lookup_key(value) -> tuple:
+    """
+    (type rank, value) key: TRUE never matches 1, 1 matches 1.0, and text
+    compares case-insensitively, as in Excel
+    """
+    rank = _type_rank(value)
+    if rank == 2:
+        return rank, bool(value)
+    return rank, value.lower() if rank == 1 else value
+
+
+class _LookupIndex:
+    """
+    Hash, sheet-order and sorted indexes over one lookup vector, built once per table
+    The hash index serves exact matches in O(1). Approximate matches
+    (VLOOKUP/HLOOKUP TRUE, MATCH 1/-1) binary-search the values in sheet
+    order, as Excel does, so unsorted data gives Excel's row rather than the
+    nearest value; XLOOKUP's next smaller/larger uses the sorted values.
+    Blank cells and error values are never matched.
+    """
+    
+    def __init__(self, vector: List):
+        self.vector = vector
+        self.first = {}
+        self.last = {}
+        self.ordered, self.positions = [], []
+        for position, value in enumerate(vector):
+            if value is None or isinstance(value, ExcelError):
+                continue
+            key = _lookup_key(value)
+            self.first.setdefault(key, position)
+            self.last[key] = position
+            self.ordered.append(key)
+            self.positions.append(position)
+        self.sorted = {rank: sorted(key for key in self.first if key[0] == rank)
+                       for rank in (0, 1, 2)}
+        self._descending = None
+    
+    def exact(self, value, last: bool = False) -> Optional[int]:
+        """Position of the first (or last) exact match"""
+        key = _lookup_key(value)
+        return (self.last if last else self.first).get(key)
+    
+    def approximate(self, value, descending: bool = False) -> Optional[int]:
+        """
+        Excel's approximate match, assuming ascending (or descending) sheet order
+        Ascending: the last value <= lookup value; descending: the last value >= it
+        """
+        target = _lookup_key(value)
+        if not descending:
+            i = bisect_right(self.ordered, target) - 1
+            found = i >= 0 and self.ordered[i][0] == target[0]
+            return self.positions[i] if found else None
+        if self._descending is None:
+            self._descending = (self.ordered[::-1], self.positions[::-1])
+        ordered, positions = self._descending
+        i = bisect_left(ordered, target)
+        found = i < len(ordered) and ordered[i][0] == target[0]
+        return positions[i] if found else None
+    
+    def nearest(self, value, larger: bool = False, last: bool = False) -> Optional[int]:
+        """Position of the next smaller (or larger) value, first (or last) among ties"""
+        key = _lookup_key(value)
+        keys = self.sorted[key[0]]
+        i = bisect_left(keys, key) if larger else bisect_right(keys, key) - 1
+        if not 0 <= i < len(keys):
+            return None
+        return (self.last if last else self.first)[keys[i]]
+
+
+def _found(value):
+    """A lookup result; a blank cell reads as 0, as in Excel"""
+    return 0.0 if value is None else value
+
+
+# Lookup indexes keyed by id() of the table they were built from. A hit must
+# be the same table object (held here, so its id cannot be reused) with an
+# unchanged lookup vector, so tables edited in place are re-indexed.
+_LOOKUP_CACHE = OrderedDict()
+_LOOKUP_CACHE_SIZE = 256
+
+
+def _vector(array: Sequence, axis: int = 0) -> List:
+    """
+    Extract the lookup vector from a range
+    axis=0: first column of a table; axis=1: first row.
+    Single-row or single-column 2D ranges are flattened.
+    """
+    if not array or not isinstance(array[0], (list, tuple)):
+        return list(array)
+    if axis == 1:
+        return list(array[0])
+    if len(array[0]) == 1 or len(array) > 1:
+        return [row[0] for row in array]
+    return list(array[0])
+
+
+def _vector_item(array: Sequence, position: int):
+    """Item at a 0-based position of a vector or single-row/column range"""
+    if not array or not isinstance(array[0], (list, tuple)):
+        return array[position]
+    if len(array) == 1 and len(array[0]) > 1:
+        return array[0][position]
+    return array[position][0]
+
+
+def _lookup_index(array: Sequence, axis: int = 0) -> _LookupIndex:
+    """Return the cached index for a table, building it on first use"""
+    cache_key = (id(array), axis)
+    cached = _LOOKUP_CACHE.get(cache_key)
+    vector = _vector(array, axis)
+    if cached is not None and cached[0] is array and cached[1].vector == vector:
+        _LOOKUP_CACHE.move_to_end(cache_key)
+        return cached[1]
+    index = _LookupIndex(vector)
+    _LOOKUP_CACHE[cache_key] = (array, index)
+    if len(_LOOKUP_CACHE) > _LOOKUP_CACHE_SIZE:
+        _LOOKUP_CACHE.popitem(last=False)
+    return index
 
 
 class ExcelFormulas:
@@ -18,8 +209,14 @@ class ExcelFormulas:
         """
         Equivalent to Excel SUM() function
         Usage: =SUM(A1:A10) becomes sum_range([A1, A2, ..., A10])
+        NumPy arrays are summed element-wise (used by broadcast data tables)
+        An error value among the inputs is returned, as in Excel
         """
-        return sum(v for v in values if isinstance(v, (int, float)))
+        values = list(values)
+        error = first_error(values)
+        if error is not None:
+            return error
+        return sum(v for v in values if isinstance(v, (int, float, np.ndarray)))
     
     @staticmethod
     def compound_growth_rate(start_value: float, end_value: float, periods: int) -> float:
@@ -54,11 +251,41 @@ class ExcelFormulas:
         """
         Simple ratio calculation with zero-division protection
         Equivalent to Excel: =A1/B1
+        Works element-wise on NumPy arrays, with 0.0 where the denominator is 0
+        (and NaN for an error operand)
         """
+        if isinstance(numerator, np.ndarray) or isinstance(denominator, np.ndarray):
+            numerator, denominator = _nan_errors(numerator, denominator)
+            numerator, denominator = np.broadcast_arrays(
+                np.asarray(numerator, dtype=float), np.asarray(denominator, dtype=float)
+            )
+            return np.divide(numerator, denominator, out=np.zeros(numerator.shape),
+                             where=denominator != 0)
         if denominator == 0:
             return 0.0
         return numerator / denominator
     
+    @staticmethod
+    def divide(numerator, denominator):
+        """
+        Excel's / operator: #DIV/0! when the denominator is 0
+        Element-wise on NumPy arrays, with NaN where the denominator is 0 or an
+        operand is an error
+        """
+        if isinstance(numerator, np.ndarray) or isinstance(denominator, np.ndarray):
+            numerator, denominator = _nan_errors(numerator, denominator)
+            numerator, denominator = np.broadcast_arrays(
+                np.asarray(numerator, dtype=float), np.asarray(denominator, dtype=float)
+            )
+            return np.divide(numerator, denominator, out=np.full(numerator.shape, np.nan),
+                             where=denominator != 0)
+        error = first_error((numerator, denominator))
+        if error is not None:
+            return error
+        if denominator == 0:
+            return DIV0
+        return numerator / denominator
+    
     @staticmethod
     def multiply_range(multiplier: float, values: List[float]) -> List[float]:
         """
@@ -68,11 +295,21 @@ class ExcelFormulas:
         return [multiplier * value for value in values]
     
     @staticmethod
-    def if_condition(condition: bool, true_value, false_value):
+    def if_condition(condition: bool, true_value, false_value=False):
         """
         Equivalent to Excel IF() function
         Usage: =IF(A1>0, "Positive", "Not Positive")
+        Without a false value the result is FALSE, as in Excel. An array
+        condition selects element-wise (NaN, i.e. error, elements stay NaN);
+        an error condition is returned.
         """
+        if isinstance(condition, ExcelError):
+            return condition
+        if isinstance(condition, np.ndarray):
+            result = np.where(condition, *_nan_errors(true_value, false_value))
+            if condition.dtype.kind == 'f':
+                result = np.where(np.isnan(condition), np.nan, result)
+            return result
         return true_value if condition else false_value
     
     @staticmethod
@@ -82,6 +319,108 @@ class ExcelFormulas:
         Usage: vlookup_simple("key", {"key": "value"}, "default")
         """
         return table_dict.get(lookup_value, default_value)
+    
+    @staticmethod
+    def vlookup(lookup_value, table: Sequence[Sequence], col_index: int,
+                range_lookup: bool = True, default_value=NA):
+        """
+        Equivalent to Excel VLOOKUP() function
+        Usage: =VLOOKUP(A1, B1:D100, 3, FALSE) becomes vlookup(a1, rows, 3, False)
+        Exact match uses a cached hash index, approximate match a binary search
+        over the first column in sheet order (largest value <= lookup_value
+        when the column is sorted). Returns default_value (#N/A) when nothing
+        matches and #REF! when col_index is beyond the table.
+        """
+        if isinstance(lookup_value, ExcelError):
+            return lookup_value
+        if not 1 <= int(col_index) <= (len(table[0]) if table else 0):
+            return VALUE if int(col_index) < 1 else REF
+        index = _lookup_index(table, axis=0)
+        row = index.approximate(lookup_value) if range_lookup else index.exact(lookup_value)
+        if row is None:
+            return default_value
+        return _found(table[row][int(col_index) - 1])
+    
+    @staticmethod
+    def hlookup(lookup_value, table: Sequence[Sequence], row_index: int,
+                range_lookup: bool = True, default_value=NA):
+        """
+        Equivalent to Excel HLOOKUP() function
+        Same as vlookup() but searches the first row and returns from row_index
+        """
+        if isinstance(lookup_value, ExcelError):
+            return lookup_value
+        if not 1 <= int(row_index) <= len(table):
+            return VALUE if int(row_index) < 1 else REF
+        index = _lookup_index(table, axis=1)
+        col = index.approximate(lookup_value) if range_lookup else index.exact(lookup_value)
+        if col is None:
+            return default_value
+        return _found(table[int(row_index) - 1][col])
+    
+    @staticmethod
+    def match(lookup_value, lookup_array: Sequence, match_type: int = 1,
+              default_value=NA):
+        """
+        Equivalent to Excel MATCH() function, returns a 1-based position
+        match_type 1: largest value <= lookup_value (ascending data); 0: exact;
+        -1: smallest value >= lookup_value (descending data). Returns
+        default_value (#N/A) when nothing matches.
+        """
+        if isinstance(lookup_value, ExcelError):
+            return lookup_value
+        index = _lookup_index(lookup_array)
+        if match_type == 0:
+            position = index.exact(lookup_value)
+        else:
+            position = index.approximate(lookup_value, descending=match_type < 0)
+        return default_value if position is None else position + 1
+    
+    @staticmethod
+    def index(array: Sequence, row_num: int, col_num: Optional[int] = None):
+        """
+        Equivalent to Excel INDEX() function (1-based row and column numbers)
+        Usage: =INDEX(B1:D100, MATCH(...), 2) becomes index(rows, match(...), 2)
+        An error position (e.g. #N/A from MATCH) is returned
+        """
+        error = first_error((row_num, col_num))
+        if error is not None:
+            return error
+        if not array or not isinstance(array[0], (list, tuple)):
+            return _found(array[int(row_num) - 1])
+        if col_num is None:
+            if len(array) == 1:
+                return _found(array[0][int(row_num) - 1])
+            row = array[int(row_num) - 1]
+            return _found(row[0]) if len(row) == 1 else row
+        return _found(array[int(row_num) - 1][int(col_num) - 1])
+    
+    @staticmethod
+    def xlookup(lookup_value, lookup_array: Sequence, return_array: Sequence,
+                if_not_found=NA, match_mode: int = 0, search_mode: int = 1):
+        """
+        Equivalent to Excel XLOOKUP() function
+        match_mode 0: exact; -1: exact or next smaller; 1: exact or next larger
+        search_mode 1: first match; -1: last match
+        """
+        if isinstance(lookup_value, ExcelError):
+            return lookup_value
+        index = _lookup_index(lookup_array)
+        last = search_mode < 0
+        position = index.exact(lookup_value, last=last)
+        if position is None and match_mode in (-1, 1):
+            position = index.nearest(lookup_value, larger=match_mode == 1, last=last)
+        if position is None:
+            return if_not_found
+        return _found(_vector_item(return_array, position))
+    
+    @staticmethod
+    def clear_lookup_cache():
+        """
+        Drop all cached lookup indexes
+        Edited tables are re-indexed automatically; this only frees the cached indexes
+        """
+        _LOOKUP_CACHE.clear()
 
 
 class FinancialFormulas:
@@ -145,6 +484,51 @@ class FinancialFormulas:
         
         return None  # Failed to converge
     
+    @staticmethod
+    def discount_factors(rates, periods: int) -> np.ndarray:
+        """
+        Discount factors 1 / (1 + rate)^t for t = 1..periods
+        rates may be a scalar or an array; the result has shape rates.shape + (periods,)
+        """
+        t = np.arange(1, periods + 1, dtype=float)
+        return (1.0 + np.asarray(rates, dtype=float)[..., np.newaxis]) ** -t
+    
+    @staticmethod
+    def npv_batch(rates, cash_flows) -> np.ndarray:
+        """
+        Vectorized NPV for many cash-flow series and/or rates at once
+        cash_flows has shape (..., periods); rates broadcasts against cash_flows.shape[:-1]
+        Same convention as npv(): the first cash flow is discounted one period
+        """
+        cash_flows = np.asarray(cash_flows, dtype=float)
+        factors = FinancialFormulas.discount_factors(rates, cash_flows.shape[-1])
+        return (cash_flows * factors).sum(axis=-1)
+    
+    @staticmethod
+    def irr_batch(cash_flows, initial_guess: float = 0.1, max_iterations: int = 100,
+                  tolerance: float = 1e-6) -> np.ndarray:
+        """
+        Vectorized Newton-Raphson IRR for a batch of cash-flow series (..., periods)
+        Same convention as irr_newton_raphson(); NaN where a series does not converge
+        """
+        cash_flows = np.asarray(cash_flows, dtype=float)
+        t = np.arange(1, cash_flows.shape[-1] + 1, dtype=float)
+        rate = np.full(cash_flows.shape[:-1], initial_guess, dtype=float)
+        done = np.zeros(rate.shape, dtype=bool)
+        
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            for _ in range(max_iterations):
+                growth = (1.0 + rate)[..., np.newaxis]
+                npv_val = (cash_flows * growth ** -t).sum(axis=-1)
+                npv_deriv = (-cash_flows * t * growth ** -(t + 1)).sum(axis=-1)
+                done |= np.abs(npv_val) < tolerance
+                step = np.where(done | (np.abs(npv_deriv) < tolerance), 0.0, npv_val / npv_deriv)
+                rate = rate - step
+                if done.all():
+                    break
+        
+        return np.where(done, rate, np.nan)
+    
     @staticmethod
     def debt_service_coverage_ratio(net_operating_income: float, 
                                    debt_service: float) -> float:
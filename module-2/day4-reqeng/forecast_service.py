@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Forecast Service - Local asyncio HTTP endpoint for CorporateFinancialModel
+POST /forecast with a JSON body of FinancialData fields returns the
+run_full_forecast result. Identical in-flight requests are coalesced,
+concurrent requests are micro-batched into one run_forecast_batch call, and
+repeats are served from an LRU result cache with a TTL. Batches run in the
+default executor so the event loop keeps accepting requests, and every
+caller gets its own copy of a result. Standard library only; runs fully
+locally.
+
+Usage:
+    python forecast_service.py serve --port 8080
+    python forecast_service.py loadtest --port 8080 --requests 5000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import copy
+import dataclasses
+import json
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from corporate_forecast_model import FinancialData, run_forecast_batch
+
+
+FIELDS = {field.name for field in dataclasses.fields(FinancialData)}
+
+
+class TTLCache:
+    """
+    Least-recently-used cache whose entries expire after ttl seconds
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def parse_payload(payload: Dict[str, Any]) -> Tuple[str, FinancialData]:
+    """
+    Validate a FinancialData-style payload
+    Returns a canonical key (identical assumptions -> identical key) and the data object
+    """
+    unknown = set(payload) - FIELDS
+    if unknown:
+        raise ValueError(f"Unknown fields: {sorted(unknown)}")
+    values = {}
+    for name, value in payload.items():
+        if name == 'years':
+            if not isinstance(value, list) or not all(isinstance(y, int) for y in value):
+                raise ValueError("'years' must be a list of integers")
+            values[name] = list(value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[name] = float(value)
+        else:
+            raise ValueError(f"'{name}' must be a number")
+    data = FinancialData(**values)
+    key = json.dumps(dataclasses.asdict(data), sort_keys=True)
+    return key, data
+
+
+class ForecastService:
+    """
+    Request coalescing, micro-batching and caching in front of the forecast model
+
+    batch_window is how long (seconds) the batcher waits for more requests
+    after the first one arrives; max_batch caps a single vectorized run.
+    """
+
+    def __init__(self, batch_window: float = 0.002, max_batch: int = 512,
+                 cache_size: int = 10000, cache_ttl: float = 300.0):
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.cache = TTLCache(cache_size, cache_ttl)
+        self.in_flight: Dict[str, asyncio.Future] = {}
+        self.queue: Optional[asyncio.Queue] = None
+        self.batcher: Optional[asyncio.Task] = None
+        self.stats = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'batches': 0, 'evaluated': 0}
+
+    def _start_batcher(self):
+        """Create the request queue and its batcher task on first use (serve() or a direct forecast())"""
+        if self.batcher is None or self.batcher.done():
+            self.queue = asyncio.Queue()
+            self.batcher = asyncio.create_task(self._batcher())
+
+    async def forecast(self, payload: Dict[str, Any]) -> Dict:
+        """Result for one payload: from cache, from an identical in-flight request, or from the next batch"""
+        self.stats['requests'] += 1
+        key, data = parse_payload(payload)
+
+        # Cached and coalesced results are shared, so callers get deep copies
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            return copy.deepcopy(cached)
+
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            return copy.deepcopy(await future)
+
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+        self._start_batcher()
+        await self.queue.put((key, data, future))
+        return copy.deepcopy(await future)
+
+    async def _batcher(self):
+        """Collect queued requests for batch_window seconds, then evaluate them together"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.stats['batches'] += 1
+            self.stats['evaluated'] += len(batch)
+            try:
+                results = await loop.run_in_executor(
+                    None, run_forecast_batch, [data for _, data, _ in batch])
+            except Exception as exc:  # Fail the whole batch rather than hang its callers
+                for key, _, future in batch:
+                    self.in_flight.pop(key, None)
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (key, _, future), result in zip(batch, results):
+                self.cache.put(key, result)
+                self.in_flight.pop(key, None)
+                if not future.done():
+                    future.set_result(result)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Minimal HTTP/1.1 handler with keep-alive"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, response = await self._route(method, path, body)
+                payload = json.dumps(response, default=str).encode()
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[str, Any]:
+        if method == 'GET' and path == '/health':
+            return '200 OK', {'status': 'ok', 'cache_entries': len(self.cache), **self.stats}
+        if method == 'POST' and path == '/forecast':
+            try:
+                payload = json.loads(body or b'{}')
+                if not isinstance(payload, dict):
+                    raise ValueError("Body must be a JSON object")
+                return '200 OK', await self.forecast(payload)
+            except (ValueError, TypeError) as exc:
+                return '400 Bad Request', {'error': str(exc)}
+        return '404 Not Found', {'error': f"No route for {method} {path}"}
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8080):
+        """Run the HTTP server until cancelled"""
+        self._start_batcher()
+        server = await asyncio.start_server(self._handle, host, port)
+        print(f"Forecast service listening on http://{host}:{port} (POST /forecast, GET /health)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.batcher.cancel()
+
+
+async def _post(reader, writer, body: bytes) -> float:
+    """Send one keep-alive POST /forecast and return its latency in seconds"""
+    start = time.perf_counter()
+    writer.write(
+        b"POST /forecast HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        + f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return time.perf_counter() - start
+
+
+async def load_test(host: str = '127.0.0.1', port: int = 8080, requests: int = 5000,
+                    concurrency: int = 64, distinct: int = 500) -> Dict[str, float]:
+    """
+    Fire requests from concurrent keep-alive connections and report latency percentiles
+    Payloads are drawn from `distinct` revenue scenarios, so repeats exercise the cache
+    """
+    rng = random.Random(42)
+    bodies = [
+        json.dumps({'revenue_2020': 40000 + 40 * i, 'cost_of_sales_2020': 28684}).encode()
+        for i in range(distinct)
+    ]
+    latencies: List[float] = []
+    # The first requests % concurrency clients send one extra request
+    base, extra = divmod(requests, concurrency)
+    counts = [base + (i < extra) for i in range(concurrency)]
+
+    async def client(count):
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for _ in range(count):
+                latencies.append(await _post(reader, writer, rng.choice(bodies)))
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(count) for count in counts if count))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(p):
+        if not latencies:
+            return float('nan')
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000
+
+    return {
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(50),
+        'p99_ms': percentile(99)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forecast-as-a-service")
+    parser.add_argument('mode', choices=['serve', 'loadtest'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--requests', type=int, default=5000, help="Load test: total requests")
+    parser.add_argument('--concurrency', type=int, default=64, help="Load test: connections")
+    parser.add_argument('--distinct', type=int, default=500, help="Load test: distinct payloads")
+    args = parser.parse_args()
+
+    if args.mode == 'serve':
+        try:
+            asyncio.run(ForecastService().serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    report = asyncio.run(load_test(args.host, args.port, args.requests,
+                                   args.concurrency, args.distinct))
+    print("=" * 50)
+    print("FORECAST SERVICE LOAD TEST")
+    print("=" * 50)
+    print(f"Requests:     {report['requests']:,}")
+    print(f"Throughput:   {report['requests_per_second']:,.0f} req/s")
+    print(f"Latency p50:  {report['p50_ms']:.2f} ms")
+    print(f"Latency p99:  {report['p99_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Formula Profiler - Optional profiling mode for formula evaluation
+Records call counts and cumulative time per cell, per formula group and per
+function, and produces a ranked hot-cell report (text and JSON) plus a
+flame-graph-compatible folded-stack trace.
+
+Function timings come from two sources: FormulaEngine cells call an
+instrumented copy of ExcelFormulas (see instrumented()), and
+CorporateFinancialModel's forecast methods are wrapped on the model
+instance (see instrument()). The classes themselves are never patched.
+"""
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+
+# Shared no-op context used when profiling is disabled
+_NO_PROFILE = nullcontext()
+
+
+def no_profile(name: str, group: str = 'other'):
+    """
+    Stand-in for FormulaProfiler.cell when profiling is disabled
+    Returns a shared no-op context so the disabled path costs one call
+    """
+    return _NO_PROFILE
+
+
+class FormulaProfiler:
+    """
+    Collects per-cell, per-group and per-function timings
+
+    Frames are nested: an engine cell that calls ExcelFormulas.divide
+    produces the stack evaluate;D16;ExcelFormulas.divide
+    """
+
+    def __init__(self):
+        self.cells = {}       # cell -> [calls, cumulative seconds, group]
+        self.groups = {}      # group -> [calls, cumulative seconds]
+        self.functions = {}   # function -> [calls, cumulative seconds]
+        self.folded = {}      # "a;b;c" -> self time in seconds
+        self._stack = []      # [name, start, child seconds]
+
+    def _push(self, name: str):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _pop(self) -> float:
+        name, start, child = self._stack[-1]
+        elapsed = time.perf_counter() - start
+        path = ';'.join(frame[0] for frame in self._stack)
+        self.folded[path] = self.folded.get(path, 0.0) + elapsed - child
+        self._stack.pop()
+        if self._stack:
+            self._stack[-1][2] += elapsed
+        return elapsed
+
+    @contextmanager
+    def cell(self, name: str, group: str = 'other'):
+        """
+        Time the evaluation of one cell (or named line item)
+        Usage: with profiler.cell('E32', 'growth_rates'): ...
+        """
+        self._push(name)
+        try:
+            yield
+        finally:
+            elapsed = self._pop()
+            stats = self.cells.setdefault(name, [0, 0.0, group])
+            stats[0] += 1
+            stats[1] += elapsed
+            group_stats = self.groups.setdefault(group, [0, 0.0])
+            group_stats[0] += 1
+            group_stats[1] += elapsed
+
+    @contextmanager
+    def frame(self, name: str):
+        """Time an enclosing block (e.g. a whole forecast run) without counting it as a cell"""
+        self._push(name)
+        try:
+            yield
+        finally:
+            self._pop()
+
+    def _wrap(self, name: str, func):
+        """Wrap a callable so every call is recorded under the given function name"""
+        profiler = self
+
+        def wrapper(*args, **kwargs):
+            profiler._push(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = profiler._pop()
+                stats = profiler.functions.setdefault(name, [0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed
+
+        wrapper.__wrapped__ = func
+        wrapper.__name__ = getattr(func, '__name__', name)
+        wrapper.__doc__ = getattr(func, '__doc__', None)
+        return wrapper
+
+    def instrumented(self, cls: type) -> SimpleNamespace:
+        """
+        Stand-in for a class of static formula functions (e.g. ExcelFormulas)
+        whose calls are recorded; the class itself is left untouched, so other
+        code and threads keep calling the originals
+        """
+        return SimpleNamespace(**{
+            attr: self._wrap(f"{cls.__name__}.{attr}", raw.__func__)
+            for attr, raw in vars(cls).items()
+            if not attr.startswith('_') and isinstance(raw, staticmethod)
+        })
+
+    @contextmanager
+    def instrument(self, *targets):
+        """
+        Temporarily wrap the public methods of the given objects
+        Wrappers shadow the methods in each instance's own dict and are
+        removed on exit; classes are not patched. Do not use an object from
+        other threads while it is instrumented.
+        """
+        patched = []
+        try:
+            for target in targets:
+                if isinstance(target, type):
+                    raise TypeError("instrument() wraps instances; use instrumented() for classes")
+                owner = type(target)
+                for attr, raw in vars(owner).items():
+                    if attr.startswith('_') or not callable(raw):
+                        continue
+                    patched.append((target, attr))
+                    setattr(target, attr, self._wrap(f"{owner.__name__}.{attr}", getattr(target, attr)))
+            yield self
+        finally:
+            for target, attr in reversed(patched):
+                delattr(target, attr)
+
+    @staticmethod
+    def _ranked(table: Dict, top: Optional[int]) -> List:
+        ranked = sorted(table.items(), key=lambda item: item[1][1], reverse=True)
+        return ranked[:top] if top else ranked
+
+    def to_dict(self, top: Optional[int] = None) -> Dict:
+        """Ranked profile as a JSON-serializable dictionary"""
+        return {
+            'cells': [
+                {'cell': name, 'group': group, 'calls': calls, 'seconds': seconds}
+                for name, (calls, seconds, group) in self._ranked(self.cells, top)
+            ],
+            'groups': [
+                {'group': name, 'calls': calls, 'seconds': seconds}
+                for name, (calls, seconds) in self._ranked(self.groups, top)
+            ],
+            'functions': [
+                {'function': name, 'calls': calls, 'seconds': seconds}
+                for name, (calls, seconds) in self._ranked(self.functions, top)
+            ]
+        }
+
+    def report(self, top: int = 20) -> str:
+        """Ranked hot-cell report as text"""
+        lines = ["=" * 70, "FORMULA PROFILE - HOT CELLS", "=" * 70]
+        lines.append(f"{'Cell':<20} {'Group':<20} {'Calls':>8} {'Time (ms)':>12}")
+        lines.append("-" * 70)
+        for name, (calls, seconds, group) in self._ranked(self.cells, top):
+            lines.append(f"{name:<20} {group:<20} {calls:>8} {seconds * 1000:>12.3f}")
+
+        lines.append(f"\n{'Group':<41} {'Calls':>8} {'Time (ms)':>12}")
+        lines.append("-" * 70)
+        for name, (calls, seconds) in self._ranked(self.groups, top):
+            lines.append(f"{name:<41} {calls:>8} {seconds * 1000:>12.3f}")
+
+        lines.append(f"\n{'Function':<56} {'Calls':>8} {'Time (ms)':>12}")
+        lines.append("-" * 78)
+        for name, (calls, seconds) in self._ranked(self.functions, top):
+            lines.append(f"{name:<56} {calls:>8} {seconds * 1000:>12.3f}")
+        return "\n".join(lines)
+
+    def save_json(self, path: str, top: Optional[int] = None):
+        """Save the ranked profile as JSON"""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(top), f, indent=2)
+
+    def save_folded(self, path: str):
+        """
+        Save the trace in folded-stack format (one "a;b;c microseconds" line
+        per stack), readable by flamegraph.pl and speedscope
+        """
+        with open(path, 'w') as f:
+            for stack, seconds in sorted(self.folded.items()):
+                f.write(f"{stack} {max(int(seconds * 1e6), 0)}\n")
+
+
+if __name__ == "__main__":
+    from corporate_forecast_model import CorporateFinancialModel, FinancialData
+
+    profiler = FormulaProfiler()
+    model = CorporateFinancialModel(FinancialData(), profiler=profiler)
+    model.run_full_forecast()
+
+    print(profiler.report())
+    profiler.save_json('formula_profile.json')
+    profiler.save_folded('formula_profile.folded')
+    print("\nProfile saved to 'formula_profile.json' and 'formula_profile.folded'")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Synthetic Workbook Generator - Corporate-model-shaped workbooks of any size
+Used by benchmarks.py to measure how the formula stack scales. The layout
+mimics the Forecast sheet: blocks of copied rows where each period grows
+the previous one by an assumption looked up on an 'Inputs' sheet, followed
+by a SUM subtotal row per block.
+
+Usage:
+    python synthetic_workbook.py 100000 synthetic_100k.xlsx
+"""
+
+import random
+import sys
+from typing import Dict, Iterator, List, Tuple
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+
+def _rows(n_formulas: int, periods: int, block_rows: int) -> Iterator[Tuple[int, str, List]]:
+    """
+    Yield (row number, row label, [cell values]) for the Forecast sheet
+    Column A holds the label, column B the base value (cross-sheet reference),
+    columns C onwards the period formulas copied along the row.
+    """
+    row, produced, block, block_start = 2, 0, 0, 2
+    while produced < n_formulas:
+        for offset in range(block_rows):
+            if produced >= n_formulas:
+                break
+            line = [f"Line item {block}.{offset}", f"=Inputs!B{row}"]
+            for col in range(3, periods + 3):
+                prev = get_column_letter(col - 1)
+                line.append(f"={prev}{row}*(1+Inputs!$C{row})")
+            produced += periods + 1
+            yield row, line[0], line
+            row += 1
+
+        # Subtotal row summing the block's copied rows
+        line = [f"Block {block} total", None]
+        for col in range(3, periods + 3):
+            letter = get_column_letter(col)
+            line.append(f"=SUM({letter}{block_start}:{letter}{row - 1})")
+        produced += periods
+        yield row, line[0], line
+        row += 1
+        block += 1
+        block_start = row
+
+
+def synthetic_inputs(last_row: int, seed: int = 42) -> Dict[str, float]:
+    """Base values (column B) and growth rates (column C) for Inputs rows 2..last_row"""
+    rng = random.Random(seed)
+    inputs = {}
+    for row in range(2, last_row + 1):
+        inputs[f"Inputs!B{row}"] = round(rng.uniform(100, 10000), 2)
+        inputs[f"Inputs!C{row}"] = round(rng.uniform(-0.02, 0.06), 4)
+    return inputs
+
+
+def synthetic_analysis(n_formulas: int, periods: int = 10, block_rows: int = 20) -> Tuple[Dict, Dict]:
+    """
+    Build the excel_analyzer-style result for a synthetic sheet without writing a file
+    Returns (analysis, inputs) ready for FormulaEngine.from_analysis(analysis, inputs=inputs)
+    """
+    formulas, data_values = [], {}
+    for col in range(3, periods + 3):
+        data_values[f"{get_column_letter(col)}1"] = {'value': 2020 + col - 3, 'row_label': 'Row1'}
+    last_row = 1
+    for row, label, line in _rows(n_formulas, periods, block_rows):
+        last_row = row
+        data_values[f"A{row}"] = {'value': label, 'row_label': label}
+        for col, value in enumerate(line[1:], start=2):
+            if value is None:
+                continue
+            letter = get_column_letter(col)
+            formulas.append({
+                'cell': f"{letter}{row}", 'row': row, 'col': col, 'col_letter': letter,
+                'formula': value, 'row_label': label
+            })
+    analysis = {
+        'formulas': formulas,
+        'data_values': data_values,
+        'categories': {},
+        'sheet_info': {'rows': last_row, 'columns': periods + 2}
+    }
+    return analysis, synthetic_inputs(last_row)
+
+
+def generate_workbook(path: str, n_formulas: int, periods: int = 10, block_rows: int = 20):
+    """
+    Write a synthetic workbook with about n_formulas formulas on a 'Forecast'
+    sheet referencing an 'Inputs' sheet (streamed, so 10^6 formulas fit in memory)
+    """
+    wb = Workbook(write_only=True)
+    forecast = wb.create_sheet('Forecast')
+    forecast.append([None, None] + [2020 + i for i in range(periods)])
+    last_row = 1
+    for row, _, line in _rows(n_formulas, periods, block_rows):
+        forecast.append(line)
+        last_row = row
+
+    inputs = synthetic_inputs(last_row)
+    sheet = wb.create_sheet('Inputs')
+    sheet.append(['Line', 'Base value', 'Growth rate'])
+    for row in range(2, last_row + 1):
+        sheet.append([row, inputs[f"Inputs!B{row}"], inputs[f"Inputs!C{row}"]])
+    wb.save(path)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    path = sys.argv[2] if len(sys.argv) > 2 else f"synthetic_{n}.xlsx"
+    generate_workbook(path, n)
+    print(f"Synthetic workbook with ~{n:,} formulas saved to '{path}'")
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Three-Statement Model - Linked P&L, balance sheet and cash flow projection
+Built from FinancialData and computed as NumPy arrays of shape
+(scenarios, periods). The links follow the Forecast sheet:
+
+    EBITDA        = EBITDA margin * revenue                       (row 37)
+    PP&E          = (previous PP&E + capex) / (1 + depreciation)  (row 52)
+    Depreciation  = -depreciation rate * PP&E                     (row 39)
+    Debt          = fixed debt to EBITDA ratio * EBITDA           (row 56)
+    Interest      = -interest rate * debt                         (row 40)
+    Tax           = -tax rate * EBT                               (row 42)
+    Retained      = previous retained + net income - dividends    (row 58)
+    Closing cash  = opening cash + free cash flow + financing     (row 97)
+
+Each column is one point of the year grid (2020, 2025, ...), and flows are
+annual amounts. Stocks roll forward by years_per_period years of flows per
+column, the same convention dcf_valuation uses to value the columns.
+Every recurrence has a closed form (cumulative products and sums over the
+period axis), so adding periods or scenarios never adds a Python loop.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from corporate_forecast_model import CorporateFinancialModel, FinancialData
+
+
+@dataclass
+class StatementAssumptions:
+    """Base year (2020) figures from the Forecasting Assumptions block"""
+    total_assets_2020: float = 67659      # D12
+    ebitda_2020: float = 10933            # D18
+    depreciation_2020: float = 2018       # D19: =2018/D8
+    interest_2020: float = 624            # D20: =624/D10
+    tax_2020: float = 1923                # D21: =1923/SUM(D37,D39:D41)
+    dividends_2020: float = 4279          # D25: =4279/D11
+    capex_2020: float = 932               # Actual!K51: =-158-863+89 (D22: =-Actual!$K51/$D15)
+
+
+def _field(scenarios: Sequence[FinancialData], name: str) -> np.ndarray:
+    """One FinancialData field across scenarios as a column vector"""
+    return np.array([getattr(data, name) for data in scenarios], dtype=float)[:, None]
+
+
+def _safe_divide(numerator, denominator):
+    """Excel-style ratio returning 0 where the denominator is 0"""
+    numerator, denominator = np.broadcast_arrays(np.asarray(numerator, dtype=float),
+                                                 np.asarray(denominator, dtype=float))
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator),
+                     where=denominator != 0)
+
+
+def project_statements(scenarios: Sequence[FinancialData],
+                       assumptions: Optional[StatementAssumptions] = None,
+                       growth_rates: Optional[np.ndarray] = None) -> Dict:
+    """
+    Project the three linked statements for every scenario
+
+    scenarios must share one year grid. growth_rates gives the revenue growth
+    applied in each forecast period, shape (periods - 1,) or
+    (paths, periods - 1); by default the IAM-derived rates used by
+    run_full_forecast, so the revenue and cost rows match it exactly.
+    A single scenario with per-path growth rates gives Monte Carlo paths.
+    Returns {'years', 'years_per_period', 'income_statement', 'balance_sheet', 'cash_flow',
+    'checks'}, each statement a dict of (scenarios, periods) arrays.
+    """
+    if not scenarios:
+        raise ValueError("At least one scenario is required")
+    years = list(scenarios[0].years)
+    if any(list(data.years) != years for data in scenarios):
+        raise ValueError("All scenarios must share the same years")
+    steps = np.diff(years)
+    if np.any(steps != steps[:1]):
+        raise ValueError(f"Forecast years must be evenly spaced: {years}")
+    years_per_period = int(steps[0]) if len(steps) else 1
+    a = assumptions or StatementAssumptions()
+
+    # Balance sheet opening values, rates and ratios (column vectors over scenarios)
+    cash_0 = _field(scenarios, 'opening_cash')
+    ppe_0 = _field(scenarios, 'property_plant_equipment')
+    goodwill = _field(scenarios, 'goodwill_base') + _field(scenarios, 'intangible_assets_base')
+    debt_0 = _field(scenarios, 'non_current_debt')
+    equity = _field(scenarios, 'shareholder_equity')
+    revenue_0 = _field(scenarios, 'revenue_2020')
+    cost_0 = _field(scenarios, 'cost_of_sales_2020')
+
+    cost_ratio = _safe_divide(cost_0, revenue_0)
+    ebitda_margin = _safe_divide(a.ebitda_2020, revenue_0)
+    opex_ratio = (1 - cost_ratio) - ebitda_margin                 # D17: =(1-$D16)-D18/D15
+    depreciation_rate = _safe_divide(a.depreciation_2020, ppe_0)
+    capex_ratio = _safe_divide(a.capex_2020, revenue_0)          # D22: =-Actual!$K51/$D15
+    interest_rate = _safe_divide(a.interest_2020, debt_0)
+    debt_to_ebitda = _safe_divide(debt_0, a.ebitda_2020)          # E10: =$D10/$D18
+    dividend_rate = _safe_divide(a.dividends_2020, equity)
+    other_assets = a.total_assets_2020 - (cash_0 + ppe_0 + goodwill)        # D7
+    current_liabilities = a.total_assets_2020 - (debt_0 + equity)          # D55
+
+    # Revenue path: cumulative growth over the forecast periods
+    if growth_rates is None:
+        rates = CorporateFinancialModel(scenarios[0]).calculate_revenue_growth_rates()
+        growth_rates = np.array([rates.get(year, 0.0) for year in years[1:]])
+    growth = np.atleast_2d(np.asarray(growth_rates, dtype=float))
+    growth = np.broadcast_to(growth, (max(len(scenarios), growth.shape[0]), len(years) - 1))
+    growth_index = np.concatenate([np.ones((len(growth), 1)), np.cumprod(1 + growth, axis=1)],
+                                  axis=1)
+    revenue = revenue_0 * growth_index
+    cost_of_sales = -cost_ratio * revenue
+    gross_profit = revenue + cost_of_sales
+    ebitda = ebitda_margin * revenue
+    operating_expenses = -opex_ratio * revenue                    # Row 36
+
+    # PP&E recurrence over n = years_per_period years of capex and depreciation,
+    # ppe_t = (ppe_t-1 + n * capex_t) / (1 + n * d), in closed form:
+    # ppe_t = k^t * (ppe_0 + sum_{s<=t} n * capex_s * k^(1-s)), with k = 1 / (1 + n * d)
+    periods = np.arange(len(years))
+    k = 1 / (1 + years_per_period * depreciation_rate)
+    capex = capex_ratio * revenue
+    capex[:, 0] = 0.0                                             # Opening balance already includes it
+    ppe = k ** periods * (ppe_0 + np.cumsum(years_per_period * capex * k ** (1 - periods), axis=1))
+    depreciation = -depreciation_rate * ppe
+
+    debt = debt_to_ebitda * ebitda
+    interest = -interest_rate * debt
+    earnings_before_tax = ebitda + depreciation + interest
+    tax = -_safe_divide(a.tax_2020, ebitda[:, :1] + depreciation[:, :1] + interest[:, :1]) \
+        * earnings_before_tax
+    net_income = earnings_before_tax + tax
+    dividends = dividend_rate * equity * np.ones_like(revenue)
+
+    # Cash flow statement; the base year is the opening balance sheet
+    nopat = ebitda + depreciation + tax
+    free_cash_flow = nopat - depreciation - capex                 # Gross cash flow less capex
+    debt_change = np.diff(debt, axis=1, prepend=debt[:, :1])
+    financing = years_per_period * (interest - dividends) + debt_change
+    cash_change = years_per_period * free_cash_flow + financing
+    cash_change[:, 0] = 0.0
+    cash = cash_0 + np.cumsum(cash_change, axis=1)
+
+    retained_flow = years_per_period * (net_income - dividends)
+    retained_flow[:, 0] = 0.0
+    retained_earnings = np.cumsum(retained_flow, axis=1)
+
+    full = np.ones_like(revenue)
+    balance_sheet = {
+        'cash': cash,
+        'other_assets': other_assets * full,
+        'property_plant_equipment': ppe,
+        'goodwill_intangible': goodwill * full,
+        'current_liabilities': current_liabilities * full,
+        'non_current_debt': debt,
+        'shareholder_equity': equity * full,
+        'retained_earnings': retained_earnings
+    }
+    total_assets = cash + balance_sheet['other_assets'] + ppe + balance_sheet['goodwill_intangible']
+    total_liabilities_equity = (balance_sheet['current_liabilities'] + debt
+                                + balance_sheet['shareholder_equity'] + retained_earnings)
+    balance_sheet['total_assets'] = total_assets
+    balance_sheet['total_liabilities_equity'] = total_liabilities_equity
+
+    # Cash movement implied by the balance sheet alone (change in every other
+    # line), to reconcile against the cash flow statement
+    def movement(line):
+        return np.diff(balance_sheet[line], axis=1, prepend=balance_sheet[line][:, :1])
+    implied_cash_change = (movement('current_liabilities') + movement('non_current_debt')
+                           + movement('shareholder_equity') + movement('retained_earnings')
+                           - movement('other_assets') - movement('property_plant_equipment')
+                           - movement('goodwill_intangible'))
+
+    return {
+        'years': years,
+        'years_per_period': years_per_period,
+        'income_statement': {
+            'revenue': revenue,
+            'cost_of_sales': cost_of_sales,
+            'gross_profit': gross_profit,
+            'operating_expenses': operating_expenses,
+            'ebitda': ebitda,
+            'depreciation': depreciation,
+            'interest': interest,
+            'earnings_before_tax': earnings_before_tax,
+            'tax': tax,
+            'net_income': net_income
+        },
+        'balance_sheet': balance_sheet,
+        'cash_flow': {
+            'nopat': nopat,
+            'capital_expenditures': -capex,
+            'free_cash_flow': free_cash_flow,
+            'interest_paid': interest,
+            'debt_change': debt_change,
+            'dividends_paid': -dividends,
+            'cash_change': cash_change,
+            'closing_cash': cash
+        },
+        'checks': {
+            'balance_sheet': total_assets - total_liabilities_equity,   # Row 60
+            'cash_flow': cash_change - implied_cash_change               # Row 92
+        }
+    }
+
+
+def scenario_statements(projection: Dict, index: int = 0) -> Dict:
+    """One scenario of a projection as {statement: {line: {year: value}}}"""
+    years = projection['years']
+    return {
+        statement: {
+            line: {year: float(value) for year, value in zip(years, values[index])}
+            for line, values in lines.items()
+        }
+        for statement, lines in projection.items()
+        if statement not in ('years', 'years_per_period')
+    }
+
+
+def print_statements(projection: Dict, index: int = 0, lines: Optional[List[str]] = None):
+    """Print one scenario's statements year by year"""
+    years = projection['years']
+    print(f"{'Line item':<28}" + "".join(f"{year:>11}" for year in years))
+    for statement in ('income_statement', 'balance_sheet', 'cash_flow', 'checks'):
+        print(f"\n{statement.replace('_', ' ').upper()}")
+        for line, values in projection[statement].items():
+            if lines and line not in lines:
+                continue
+            print(f"  {line:<26}" + "".join(f"{value:>11,.0f}" for value in values[index]))
+
+
+if __name__ == "__main__":
+    import time
+
+    base = project_statements([FinancialData()])
+    print_statements(base)
+
+    forecast = CorporateFinancialModel(FinancialData()).run_full_forecast()
+    revenue_match = all(np.isclose(forecast['revenue_forecast'][year], value)
+                        for year, value in zip(base['years'], base['income_statement']['revenue'][0]))
+    print(f"\nRevenue matches run_full_forecast: {revenue_match}")
+
+    rng = np.random.default_rng(42)
+    n = 100000
+    scenarios = [FinancialData(revenue_2020=float(r)) for r in rng.uniform(40000, 60000, n)]
+    growth = rng.normal(0.015, 0.01, size=(n, len(base['years']) - 1))
+    start = time.perf_counter()
+    batch = project_statements(scenarios, growth_rates=growth)
+    elapsed = time.perf_counter() - start
+    worst = {check: np.abs(gap).max() for check, gap in batch['checks'].items()}
+    print(f"{n:,} scenarios projected in {elapsed:.2f}s, largest balance sheet gap: "
+          f"{worst['balance_sheet']:.2e}, cash flow gap: {worst['cash_flow']:.2e}")
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Workbook Diff - Structural diff between two versions of the corporate model
+Built on excel_analyzer output: every cell's normalized formula (or value)
+is hashed, the hashes are compared in bulk, and the report lists added,
+removed and changed cells plus the downstream cells they affect.
+
+Usage:
+    python workbook_diff.py "Corporate Modelling_230421.xlsx" "Corporate Modelling_230512.xlsx"
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+from excel_analyzer import analyze_excel_formulas
+from formula_engine import formula_references
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRING_RE = re.compile(r'("(?:[^"]|"")*")')
+
+
+def normalize_formula(formula: str) -> str:
+    """
+    Canonical form used for comparison
+    Whitespace, $ anchors and letter case outside string literals do not
+    change what a formula computes, so they are dropped or folded.
+    """
+    parts = _STRING_RE.split(formula)
+    for i in range(0, len(parts), 2):  # Even parts are outside string literals
+        parts[i] = _WHITESPACE_RE.sub('', parts[i]).replace('$', '').upper()
+    return ''.join(parts)
+
+
+def cell_hashes(analysis: Dict) -> Dict[str, bytes]:
+    """Hash the normalized formula or the value of every non-empty cell"""
+    hashes = {}
+    for entry in analysis['formulas']:
+        text = 'F' + normalize_formula(entry['formula'])
+        hashes[entry['cell']] = hashlib.blake2b(text.encode(), digest_size=8).digest()
+    for cell, entry in analysis['data_values'].items():
+        text = f"V{type(entry['value']).__name__}:{entry['value']}"
+        hashes[cell] = hashlib.blake2b(text.encode(), digest_size=8).digest()
+    return hashes
+
+
+def dependents_graph(analysis: Dict) -> Dict[str, Set[str]]:
+    """Reverse dependency graph: cell -> formula cells that read it"""
+    dependents = {}
+    for entry in analysis['formulas']:
+        for ref in formula_references(entry['formula']):
+            dependents.setdefault(ref, set()).add(entry['cell'])
+    return dependents
+
+
+def impact_set(cells: Iterable[str], dependents: Dict[str, Set[str]]) -> Set[str]:
+    """All cells downstream of the given cells (breadth-first, cycle-safe)"""
+    seen = set()
+    queue = deque(cells)
+    while queue:
+        for dependent in dependents.get(queue.popleft(), ()):
+            if dependent not in seen:
+                seen.add(dependent)
+                queue.append(dependent)
+    return seen
+
+
+def _sort_cells(cells: Iterable[str]) -> List[str]:
+    """Order cells by column, then row (D7, D9, D10, ..., E10, ...)"""
+    def position(cell):
+        letters = cell.rstrip('0123456789')
+        return (len(letters), letters, int(cell[len(letters):]))
+    return sorted(cells, key=position)
+
+
+def diff_analyses(old: Dict, new: Dict) -> Dict:
+    """
+    Compare two excel_analyzer results
+    Returns added/removed/changed cells and the downstream impact set; removed
+    cells are traced through the old version's graph, all others through the new.
+    """
+    old_hashes, new_hashes = cell_hashes(old), cell_hashes(new)
+    old_cells, new_cells = old_hashes.keys(), new_hashes.keys()
+
+    added = new_cells - old_cells
+    removed = old_cells - new_cells
+    changed = {cell for cell in old_cells & new_cells if old_hashes[cell] != new_hashes[cell]}
+
+    impacted = impact_set(added | changed, dependents_graph(new))
+    impacted |= impact_set(removed, dependents_graph(old))
+    impacted -= added | removed | changed
+
+    def describe(analysis):
+        lookup = {entry['cell']: entry['formula'] for entry in analysis['formulas']}
+        for cell, entry in analysis['data_values'].items():
+            lookup[cell] = entry['value']
+        return lookup
+
+    old_content, new_content = describe(old), describe(new)
+    return {
+        'added': [{'cell': c, 'new': new_content[c]} for c in _sort_cells(added)],
+        'removed': [{'cell': c, 'old': old_content[c]} for c in _sort_cells(removed)],
+        'changed': [
+            {'cell': c, 'old': old_content[c], 'new': new_content[c]}
+            for c in _sort_cells(changed)
+        ],
+        'impacted': _sort_cells(impacted)
+    }
+
+
+def diff_workbooks(old_path: str, new_path: str, sheet_name: str = 'Forecast') -> Dict:
+    """Analyze both workbooks with excel_analyzer and diff them"""
+    return diff_analyses(
+        analyze_excel_formulas(old_path, sheet_name),
+        analyze_excel_formulas(new_path, sheet_name)
+    )
+
+
+def print_diff_summary(diff: Dict, limit: int = 10):
+    """Print a short summary of a workbook diff"""
+    print("=" * 70)
+    print("WORKBOOK DIFF SUMMARY")
+    print("=" * 70)
+    print(f"Added cells:    {len(diff['added'])}")
+    print(f"Removed cells:  {len(diff['removed'])}")
+    print(f"Changed cells:  {len(diff['changed'])}")
+    print(f"Impacted cells: {len(diff['impacted'])}")
+
+    for entry in diff['changed'][:limit]:
+        print(f"  {entry['cell']}: {entry['old']}  ->  {entry['new']}")
+    if diff['impacted']:
+        print(f"\nImpacted (first {limit}): {', '.join(diff['impacted'][:limit])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff formulas between two workbook versions")
+    parser.add_argument('old', help="Older workbook (.xlsx)")
+    parser.add_argument('new', help="Newer workbook (.xlsx)")
+    parser.add_argument('--sheet', default='Forecast', help="Sheet to compare")
+    parser.add_argument('--json', dest='json_path', help="Also save the full diff as JSON")
+    args = parser.parse_args()
+
+    diff = diff_workbooks(args.old, args.new, args.sheet)
+    print_diff_summary(diff)
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(diff, f, indent=2, default=str)
+        print(f"\nDetailed diff saved to '{args.json_path}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,6 @@
 Perform k-means clustering on COGS attributes and visualize results
 using 2D PCA projection with categorical colors for clusters.
 """
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.decomposition import PCA
@@ -11,11 +10,14 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 import seaborn as sns
 
+from dataset_store import load_table
+
 def perform_clustering_analysis():
     """Perform k-means clustering with k=4 and k=6 on COGS attributes."""
     
     # Load the data
-    df = pd.read_csv('zeughauskeller-cogs.csv')
+    df = load_table('zeughauskeller_cogs', columns=['Dish Name', 'COGS_*', 'Estimated dish weight (kg)', 'Price (CHF)',
+                                                     'Total COGS Estimated (CHF)', 'Healthiness'])
     
     # Select COGS attributes (columns starting with "COGS_")
     cogs_columns = [col for col in df.columns if col.startswith('COGS_')]
@@ -7,30 +7,17 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
-import re
 
-def extract_numeric_price(price_str):
-    """Extract numeric price from price string."""
-    if pd.isna(price_str):
-        return None
-    
-    # Extract all numbers from the price string
-    numbers = re.findall(r'\d+\.?\d*', str(price_str))
-    if numbers:
-        prices = [float(num) for num in numbers]
-        return sum(prices) / len(prices)  # Average if multiple prices
-    return None
+from correlation_engine import correlate
+from dataset_store import load_table
+
+BOOTSTRAP_RESAMPLES = 1000
 
 def create_cogs_price_correlation_matrix():
     """Create correlation matrix of Price vs. each COGS attribute."""
     
     # Load the data
-    df = pd.read_csv('zeughauskeller-cogs.csv')
-    
-    # Extract numeric price
-    df['Price_Numeric'] = df['Price (CHF)'].apply(extract_numeric_price)
+    df = load_table('zeughauskeller_cogs', columns=['COGS_*', 'Price_Numeric'])
     
     # Select COGS attributes
     cogs_columns = [col for col in df.columns if col.startswith('COGS_')]
@@ -39,6 +26,10 @@ def create_cogs_price_correlation_matrix():
     # Remove rows with missing price data
     df_clean = df.dropna(subset=['Price_Numeric'])
     
+    # Pearson r, Spearman rho, R² and fitted lines for all attributes at once, with 95% bootstrap CIs
+    stats = correlate(df_clean, cogs_columns, ['Price_Numeric'],
+                      n_resamples=BOOTSTRAP_RESAMPLES).set_index('Feature')
+    
     # Create the 2x5 subplot layout
     fig, axes = plt.subplots(2, 5, figsize=(20, 10))
     fig.suptitle('Price vs. COGS Attributes Correlation Analysis\nZeughauskeller Restaurant', 
@@ -61,28 +52,15 @@ def create_cogs_price_correlation_matrix():
         # Create scatter plot
         ax.scatter(x, y, alpha=0.7, s=60, edgecolors='black', linewidth=0.5, color='steelblue')
         
-        # Calculate correlation and fit line
+        # Correlation and fitted line (constant attributes have r = R² = 0)
+        fit = stats.loc[cogs_col]
+        r2 = fit['R_squared']
+        pearson_r = fit['Pearson_r']
         if len(x) > 1 and x.std() > 0:  # Check if there's variation in x
-            # Fit linear regression
-            X_reshaped = x.values.reshape(-1, 1)
-            lr = LinearRegression()
-            lr.fit(X_reshaped, y)
-            y_pred = lr.predict(X_reshaped)
-            
-            # Calculate R²
-            r2 = r2_score(y, y_pred)
-            
-            # Plot fitted line
+            y_pred = fit['Slope'] * x.to_numpy() + fit['Intercept']
             sorted_indices = np.argsort(x)
             ax.plot(x.iloc[sorted_indices], y_pred[sorted_indices], 
                    color='red', linewidth=2, alpha=0.8)
-            
-            # Calculate Pearson correlation coefficient
-            pearson_r = np.corrcoef(x, y)[0, 1]
-            
-        else:
-            r2 = 0
-            pearson_r = 0
         
         # Store results
         correlation_results.append({
@@ -90,7 +68,12 @@ def create_cogs_price_correlation_matrix():
             'R_squared': r2,
             'Pearson_r': pearson_r,
             'Mean_COGS': x.mean(),
-            'Max_COGS': x.max()
+            'Max_COGS': x.max(),
+            'Spearman_rho': fit['Spearman_rho'],
+            'R_squared_low': fit['R_squared_low'],
+            'R_squared_high': fit['R_squared_high'],
+            'Pearson_low': fit['Pearson_low'],
+            'Pearson_high': fit['Pearson_high']
         })
         
         # Customize subplot
@@ -143,7 +126,8 @@ def create_cogs_price_correlation_matrix():
             strength = "Very Weak"
         
         print(f"{len(correlation_df) - list(correlation_df.index).index(i):2d}. {cogs_name:<20} | "
-              f"R² = {r2:.3f} | r = {pearson_r:+.3f} | {strength}")
+              f"R² = {r2:.3f} [{row['R_squared_low']:.2f}, {row['R_squared_high']:.2f}] | "
+              f"r = {pearson_r:+.3f} | ρ = {row['Spearman_rho']:+.3f} | {strength}")
     
     # Statistical summary
     print(f"\n📊 STATISTICAL SUMMARY:")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+COGS validation - check the invariants of a COGS table in one vectorized pass.
+
+    missing / not_numeric   every cost, weight, price, total and Healthiness is a number
+    negative_cost           COGS_* >= 0
+    non_positive_price      Price (CHF) > 0 (every variant of '18.50 / 22.00')
+    non_positive_weight     Estimated dish weight (kg) > 0
+    healthiness_range       Healthiness is an integer from 1 to 5
+    total_mismatch          Total COGS Estimated (CHF) = sum of COGS_* (to the rappen)
+
+Every rule is a boolean mask over whole columns; only the violating cells
+are turned into report rows, so a clean table of a million rows costs a
+few array operations. The dataset store validates each COGS CSV when it
+converts it, so analyses never see a table that breaks these rules.
+
+Usage:
+    python cogs_validation.py                          # both COGS CSVs
+    python cogs_validation.py my-cogs.csv
+    python cogs_validation.py --benchmark 1000000
+"""
+
+import argparse
+import sys
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from price_parser import parse_prices
+
+NAME_COLUMN = 'Dish Name'
+WEIGHT_COLUMN = 'Estimated dish weight (kg)'
+PRICE_COLUMN = 'Price (CHF)'
+TOTAL_COLUMN = 'Total COGS Estimated (CHF)'
+HEALTHINESS_COLUMN = 'Healthiness'
+REQUIRED_COLUMNS = [NAME_COLUMN, WEIGHT_COLUMN, PRICE_COLUMN, TOTAL_COLUMN, HEALTHINESS_COLUMN]
+
+HEALTHINESS_RANGE = (1, 5)
+# Costs are given in rappen, so the total may be off by one rounding step
+TOTAL_TOLERANCE = 0.01
+REPORTED_VIOLATIONS = 10
+
+VIOLATION_COLUMNS = ['Line', NAME_COLUMN, 'Check', 'Column', 'Value', 'Expected']
+
+
+class ValidationError(ValueError):
+    """A table breaks its invariants; violations holds the full report"""
+
+    def __init__(self, source: str, violations: pd.DataFrame):
+        self.source = source
+        self.violations = violations
+        shown = violations.head(REPORTED_VIOLATIONS).to_string(index=False)
+        more = len(violations) - REPORTED_VIOLATIONS
+        super().__init__(f"{source}: {len(violations)} violation(s)\n{shown}"
+                         + (f"\n... and {more} more" if more > 0 else ''))
+
+
+def validate_cogs(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per violating cell: Line (CSV line, header is line 1), Dish Name,
+    Check, Column, Value and Expected; empty if the table is valid
+    """
+    missing_columns = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing_columns:
+        raise KeyError(f"COGS table lacks columns {missing_columns}")
+    cogs = [column for column in df.columns if column.startswith('COGS_')]
+    columns = [*cogs, WEIGHT_COLUMN, PRICE_COLUMN, TOTAL_COLUMN, HEALTHINESS_COLUMN]
+    raw = df[columns]
+    values = raw.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    present = raw.notna().to_numpy()
+    # A price may list size variants ('18.50 / 22.00'); the store parses such
+    # text, so its smallest parsed amount is validated instead of the raw text
+    price = columns.index(PRICE_COLUMN)
+    text_prices = present[:, price] & np.isnan(values[:, price])
+    if text_prices.any():
+        values[text_prices, price] = parse_prices(df.loc[text_prices, PRICE_COLUMN])['Price_Min'].to_numpy()
+
+    def column(name):
+        return values[:, [columns.index(name)]]
+
+    costs, healthiness = values[:, :len(cogs)], column(HEALTHINESS_COLUMN)
+    low, high = HEALTHINESS_RANGE
+    # NaN compares False everywhere, so missing cells are only reported as missing
+    cost_sum = costs.sum(axis=1, keepdims=True)
+    rules = [
+        ('missing', columns, ~present, 'a number'),
+        ('not_numeric', columns, present & np.isnan(values), 'a number'),
+        ('negative_cost', cogs, costs < 0, '>= 0'),
+        ('non_positive_price', [PRICE_COLUMN], column(PRICE_COLUMN) <= 0, '> 0'),
+        ('non_positive_weight', [WEIGHT_COLUMN], column(WEIGHT_COLUMN) <= 0, '> 0'),
+        ('healthiness_range', [HEALTHINESS_COLUMN],
+         (healthiness < low) | (healthiness > high) | (healthiness % 1 != 0), f"integer {low}-{high}"),
+        ('total_mismatch', [TOTAL_COLUMN],
+         np.round(np.abs(column(TOTAL_COLUMN) - cost_sum), 2) > TOTAL_TOLERANCE, cost_sum)
+    ]
+    names = df[NAME_COLUMN]
+    rules.append(('missing', [NAME_COLUMN], (names.isna() | (names == '')).to_numpy()[:, None], 'a dish name'))
+
+    reports: List[pd.DataFrame] = []
+    for check, rule_columns, mask, expected in rules:
+        rows, positions = np.nonzero(mask)
+        if len(rows) == 0:
+            continue
+        if isinstance(expected, np.ndarray):
+            expected = np.round(expected[rows, 0], 2).astype(str)
+        value = np.empty(len(rows), dtype=object)
+        for position in np.unique(positions):
+            selected = positions == position
+            value[selected] = df[rule_columns[position]].to_numpy(dtype=object)[rows[selected]]
+        reports.append(pd.DataFrame({
+            'Line': rows + 2,
+            NAME_COLUMN: names.iloc[rows].to_numpy(),
+            'Check': check,
+            'Column': np.asarray(rule_columns, dtype=object)[positions],
+            'Value': value,
+            'Expected': expected
+        }))
+    if not reports:
+        return pd.DataFrame(columns=VIOLATION_COLUMNS)
+    return pd.concat(reports, ignore_index=True).sort_values(['Line', 'Check'], kind='stable') \
+        .reset_index(drop=True)
+
+
+def check_cogs(df: pd.DataFrame, source: str = 'COGS table') -> pd.DataFrame:
+    """Raise ValidationError if the table has violations, else return it unchanged"""
+    violations = validate_cogs(df)
+    if len(violations):
+        raise ValidationError(source, violations)
+    return df
+
+
+def benchmark(n_rows: int, path: str = 'zeughauskeller-cogs.csv', seed: int = 42) -> float:
+    """Seconds to validate n_rows resampled from a COGS CSV"""
+    import time
+
+    df = pd.read_csv(path)
+    large = df.sample(n_rows, replace=True, random_state=seed).reset_index(drop=True)
+    start = time.perf_counter()
+    validate_cogs(large)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate COGS CSV files")
+    parser.add_argument('paths', nargs='*', default=['zeughauskeller-cogs.csv', 'la-fonte-cogs.csv'])
+    parser.add_argument('--benchmark', type=int, metavar='N', help="Time validation of N resampled rows")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        elapsed = benchmark(args.benchmark, args.paths[0])
+        print(f"✅ Validated {args.benchmark:,} rows in {elapsed * 1000:.0f} ms")
+        return
+
+    failed = False
+    for path in args.paths:
+        violations = validate_cogs(pd.read_csv(path))
+        if len(violations):
+            failed = True
+            print(f"❌ {path}: {len(violations)} violation(s)")
+            print(violations.to_string(index=False))
+        else:
+            print(f"✅ {path}: all checks passed")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
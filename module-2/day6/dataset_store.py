@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Dataset store - typed columnar copies of the menu and COGS tables.
+
+The CSVs stay the source of truth; each table is converted once into a
+Parquet (or Feather) file with compact, analysis-ready types:
+
+    COGS_*, weight, prices, totals  -> float32
+    Healthiness                     -> int8
+    Restaurant, Dish Category       -> categorical
+    Price_Min/_Max/_Numeric         -> float32, parsed once from the price text
+    Price_Variants, Price_Labels    -> size variants ('Klein / Groß')
+
+A table is rebuilt automatically when its source CSV changes (the file
+stores the CSV's SHA-256), and load_table() reads only the requested
+columns and row groups, so scripts load just what they use. COGS CSVs
+are validated on conversion (cogs_validation); one that breaks its
+invariants raises ValidationError instead of being stored.
+
+Usage:
+    python dataset_store.py                       # build every table
+    python dataset_store.py --format feather
+    python dataset_store.py --info zeughauskeller_cogs
+"""
+
+import argparse
+import fnmatch
+import os
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from cogs_validation import check_cogs
+from digests import file_digest
+from price_parser import parse_prices
+
+# Bump when the typing below changes, so stored tables are rebuilt
+STORE_VERSION = 4
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_STORE_DIR = os.path.join(BASE_DIR, '.dataset_store')
+
+TABLES = {
+    'menus': {'source': 'combined_restaurant_menus.csv', 'kind': 'menu'},
+    'zeughauskeller_cogs': {'source': 'zeughauskeller-cogs.csv', 'kind': 'cogs',
+                            'restaurant': 'Zeughauskeller Zurich'},
+    'la_fonte_cogs': {'source': 'la-fonte-cogs.csv', 'kind': 'cogs',
+                      'restaurant': 'La Fonte Restaurant Pizzeria'}
+}
+
+FORMATS = {'parquet': 'parquet', 'feather': 'arrow'}
+
+
+def typed_menu(df: pd.DataFrame) -> pd.DataFrame:
+    """Menu table with categorical restaurant/category and structured prices"""
+    df = df.copy()
+    for column in ('Restaurant', 'Dish Category'):
+        df[column] = df[column].astype('category')
+    prices = parse_prices(df['Price'])
+    for column in ('Price_Min', 'Price_Max', 'Price_Numeric'):
+        df[column] = prices[column].astype('float32')
+    df['Price_Variants'] = prices['Price_Variants'].astype('int8')
+    df['Price_Labels'] = prices['Price_Labels']
+    df['Currency'] = prices['Currency'].astype('category')
+    return df
+
+
+def typed_cogs(df: pd.DataFrame, restaurant: str) -> pd.DataFrame:
+    """
+    COGS table as float32 costs with the restaurant as a categorical column
+    Price (CHF) may list size variants ('18.50 / 22.00'); it is parsed like
+    the menu prices and stored as their mean, next to Price_Min/_Max/_Numeric.
+    """
+    df = df.copy()
+    prices = parse_prices(df['Price (CHF)'])
+    numeric = [column for column in df.columns if column not in ('Dish Name', 'Healthiness', 'Price (CHF)')]
+    df[numeric] = df[numeric].astype('float32')
+    df['Healthiness'] = df['Healthiness'].astype('int8')
+    df['Price (CHF)'] = prices['Price_Numeric'].astype('float32')
+    for column in ('Price_Min', 'Price_Max', 'Price_Numeric'):
+        df[column] = prices[column].astype('float32')
+    df.insert(0, 'Restaurant', pd.Categorical([restaurant] * len(df)))
+    return df
+
+
+def table_path(name: str, store_dir: str = DEFAULT_STORE_DIR, fmt: str = 'parquet') -> str:
+    return os.path.join(store_dir, f"{name}.{FORMATS[fmt]}")
+
+
+def _read_schema(path: str, fmt: str) -> Optional[pa.Schema]:
+    """Schema of a stored table (footer only), or None if it is missing or unreadable"""
+    try:
+        return ds.dataset(path, format=fmt if fmt == 'parquet' else 'ipc').schema
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+
+def _is_current(schema: Optional[pa.Schema], digest: str) -> bool:
+    metadata = (schema and schema.metadata) or {}
+    return (metadata.get(b'store_version') == str(STORE_VERSION).encode()
+            and metadata.get(b'source_sha256') == digest.encode())
+
+
+def build_table(name: str, store_dir: str = DEFAULT_STORE_DIR, fmt: str = 'parquet',
+                force: bool = False) -> str:
+    """Convert one source CSV into the store (skipped when already up to date)"""
+    spec = TABLES[name]
+    source = os.path.join(BASE_DIR, spec['source'])
+    digest = file_digest(source)
+    path = table_path(name, store_dir, fmt)
+    if not force and _is_current(_read_schema(path, fmt), digest):
+        return path
+
+    df = pd.read_csv(source)
+    if spec['kind'] == 'menu':
+        df = typed_menu(df)
+    else:
+        df = typed_cogs(check_cogs(df, spec['source']), spec['restaurant'])
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b'store_version': str(STORE_VERSION).encode(),
+        b'source_sha256': digest.encode(),
+        b'source': spec['source'].encode()
+    })
+
+    os.makedirs(store_dir, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    if fmt == 'parquet':
+        pq.write_table(table, tmp, compression='zstd')
+    else:
+        feather.write_feather(table, tmp, compression='zstd')
+    os.replace(tmp, path)
+    return path
+
+
+def build_store(store_dir: str = DEFAULT_STORE_DIR, fmt: str = 'parquet',
+                force: bool = False) -> Dict[str, str]:
+    """Build (or refresh) every table"""
+    return {name: build_table(name, store_dir, fmt, force) for name in TABLES}
+
+
+def table_columns(name: str, store_dir: str = DEFAULT_STORE_DIR, fmt: str = 'parquet') -> List[str]:
+    """Column names of a stored table, read from the schema only"""
+    return list(_read_schema(build_table(name, store_dir, fmt), fmt).names)
+
+
+def load_table(name: str, columns: Optional[Sequence[str]] = None, filters=None,
+               store_dir: str = DEFAULT_STORE_DIR, fmt: str = 'parquet') -> pd.DataFrame:
+    """
+    Load a typed table, reading only the requested columns
+    columns may contain glob patterns ('COGS_*') and keeps the order given;
+    filters are pyarrow row filters, e.g. [('Healthiness', '>=', 4)].
+    """
+    path = build_table(name, store_dir, fmt)
+    dataset = ds.dataset(path, format=fmt if fmt == 'parquet' else 'ipc')
+    if columns is not None:
+        selected = []
+        for pattern in columns:
+            matches = fnmatch.filter(dataset.schema.names, pattern)
+            if not matches:
+                raise KeyError(f"No column matching {pattern!r} in table {name!r}")
+            selected.extend(column for column in matches if column not in selected)
+        columns = selected
+    expression = pq.filters_to_expression(filters) if filters else None
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the typed menu and COGS dataset store")
+    parser.add_argument('--format', choices=list(FORMATS), default='parquet')
+    parser.add_argument('--store-dir', default=DEFAULT_STORE_DIR)
+    parser.add_argument('--force', action='store_true', help="Rebuild even if up to date")
+    parser.add_argument('--info', metavar='TABLE', help="Show the column types of one table")
+    args = parser.parse_args()
+
+    if args.info:
+        df = load_table(args.info, store_dir=args.store_dir, fmt=args.format)
+        print(f"📊 {args.info}: {len(df)} rows, {df.memory_usage(deep=True).sum() / 1024:.1f} KiB in memory")
+        print(df.dtypes.to_string())
+        return
+
+    for name, path in build_store(args.store_dir, args.format, args.force).items():
+        print(f"✅ {name:<20} -> {os.path.relpath(path)} ({os.path.getsize(path) / 1024:.1f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
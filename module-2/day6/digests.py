@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+File digests - SHA-256 of file contents for content-addressed caches.
+
+Shared by the page cache, the dataset store, the ingredient index and the
+pipeline. Standard library only, so importing it does not pull in PDF or
+data-frame dependencies.
+"""
+
+import hashlib
+import os
+from typing import Dict
+
+_DIGESTS: Dict[tuple, str] = {}
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file, remembered per (path, size, mtime) within the process"""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _DIGESTS:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        _DIGESTS[key] = sha.hexdigest()
+    return _DIGESTS[key]
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Dish matcher - link menu dishes to COGS rows by name similarity.
+
+Menus identify dishes by ID and the printed name ("Beefsteak Tartare
+(served raw) - small portion"), the COGS tables by a free-text Dish Name
+("Beefsteak Tartar (small portion)"). Names are normalized (case, accents,
+umlaut spellings, punctuation) and compared as TF-IDF vectors of character
+trigrams, which tolerates inflections and compound words.
+
+Only candidate pairs that share a block are scored: same restaurant (and
+any other block columns both sides have) and at least one common token
+prefix; words of the restaurant's own name are ignored. Oversized blocks
+are skipped, so the work grows with the number of plausible pairs
+instead of menu rows x COGS rows.
+
+Usage:
+    python dish_matcher.py
+    python dish_matcher.py --menus extracted_restaurant_menus.csv --output menu_cogs_links.csv
+"""
+
+import argparse
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from dataset_store import load_table
+from dish_similarity import load_cogs_catalogue
+
+# Words that say nothing about which dish it is
+STOP_WORDS = {'a', 'al', 'alla', 'and', 'della', 'del', 'di', 'e', 'for', 'in', 'la', 'mit', 'nach',
+              'of', 'oder', 'served', 'the', 'und', 'with'}
+# Size and portion words: scored (they pick the variant) but never used as blocks
+VARIANT_WORDS = {'gross', 'klein', 'large', 'portion', 'regular', 'small', 'starter'}
+PREFIX_LENGTH = 4
+MAX_BLOCK_SIZE = 1000
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """'Augustiner "Schüblig"' and 'Augustiner "Schueblig" sausage' -> comparable ascii text"""
+    text = (names.astype('string').fillna('').str.lower()
+            .str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii'))
+    # Umlauts written out (ae, oe, ue) fold to the same letter as the accented form
+    text = text.str.replace(r'([aou])e', r'\1', regex=True)
+    return text.str.replace(r'[^a-z0-9]+', ' ', regex=True).str.strip()
+
+
+def drop_restaurant_words(names: pd.Series, restaurants: pd.Series) -> pd.Series:
+    """Remove the words of each row's restaurant name ('Zeughauskeller burger' -> 'burger')"""
+    tokens = names.reset_index(drop=True).str.split().explode().dropna()
+    restaurant_names = pd.Series(pd.unique(restaurants.to_numpy()))
+    own_words = pd.MultiIndex.from_frame(pd.DataFrame({
+        'Restaurant': restaurant_names,
+        'Word': normalize_names(restaurant_names).str.split()
+    }).explode('Word'))
+    row_words = pd.MultiIndex.from_arrays([restaurants.to_numpy()[tokens.index], tokens.to_numpy()])
+    kept = tokens[~row_words.isin(own_words)]
+    return kept.groupby(level=0).agg(' '.join).reindex(range(len(names)), fill_value='') \
+        .set_axis(names.index)
+
+
+def blocking_keys(names: pd.Series, prefix_length: int = PREFIX_LENGTH) -> pd.Series:
+    """Token prefixes of normalized names, one row per (row, key)"""
+    tokens = names.str.split().explode().dropna()
+    tokens = tokens[(tokens.str.len() >= 3) & ~tokens.isin(STOP_WORDS | VARIANT_WORDS)]
+    return tokens.str[:prefix_length].rename('Block_Key')
+
+
+def candidate_pairs(left: pd.DataFrame, right: pd.DataFrame, block_on: Sequence[str],
+                    prefix_length: int = PREFIX_LENGTH,
+                    max_block_size: int = MAX_BLOCK_SIZE) -> pd.DataFrame:
+    """(left position, right position) pairs sharing the block columns and a token prefix"""
+    def keyed(df):
+        keys = blocking_keys(df['_name'], prefix_length)
+        table = df.loc[keys.index, list(block_on)].assign(Block_Key=keys.to_numpy(),
+                                                          _position=df.loc[keys.index, '_position'])
+        return table.drop_duplicates()
+
+    left_keys, right_keys = keyed(left), keyed(right)
+    block = [*block_on, 'Block_Key']
+    sizes = left_keys.groupby(block, observed=True).size().rename('_left') \
+        .to_frame().join(right_keys.groupby(block, observed=True).size().rename('_right'), how='inner')
+    usable = sizes[(sizes['_left'] <= max_block_size) & (sizes['_right'] <= max_block_size)].index
+    left_keys = left_keys.set_index(block).loc[lambda df: df.index.isin(usable)].reset_index()
+    pairs = left_keys.merge(right_keys, on=block, suffixes=('_left', '_right'))
+    return pairs[['_position_left', '_position_right']].drop_duplicates().to_numpy()
+
+
+def match_dishes(menus: pd.DataFrame, cogs: pd.DataFrame, menu_name: str = 'Dish',
+                 cogs_name: str = 'Dish Name', block_on: Optional[Sequence[str]] = None,
+                 threshold: float = 0.35, keep: str = 'best') -> pd.DataFrame:
+    """
+    Links between menu rows and COGS rows
+    block_on defaults to the columns both tables share out of Restaurant and
+    Dish Category. keep='best' gives the best COGS row per menu dish;
+    keep='all' every pair above the threshold (e.g. klein and gross rows).
+    Returns Menu_Row, COGS_Row (index labels), both names and Score.
+    """
+    if block_on is None:
+        block_on = [c for c in ('Restaurant', 'Dish Category') if c in menus.columns and c in cogs.columns]
+
+    def prepared(df, name):
+        table = df[list(block_on)].astype(str).reset_index(drop=True)
+        names = normalize_names(df[name]).reset_index(drop=True)
+        if 'Restaurant' in block_on:
+            # Within a restaurant block its own name tells dishes nothing
+            names = drop_restaurant_words(names, table['Restaurant'])
+        return table.assign(_name=names, _position=np.arange(len(df)))
+
+    left, right = prepared(menus, menu_name), prepared(cogs, cogs_name)
+    pairs = candidate_pairs(left, right, block_on)
+    columns = ['Menu_Row', 'COGS_Row', 'Menu_Dish', 'COGS_Dish', 'Score']
+    if len(pairs) == 0:
+        return pd.DataFrame(columns=columns)
+
+    # Cosine similarity of L2-normalized TF-IDF rows, only for the candidate pairs
+    # Catalogues repeat names, so each distinct name is vectorized once
+    codes, unique_names = pd.factorize(pd.concat([left['_name'], right['_name']]))
+    vectors = TfidfVectorizer(analyzer='char_wb', ngram_range=(3, 3)).fit_transform(unique_names)
+    left_codes, right_codes = codes[:len(left)], codes[len(left):]
+    scores = np.asarray(vectors[left_codes[pairs[:, 0]]].multiply(
+        vectors[right_codes[pairs[:, 1]]]).sum(axis=1)).ravel()
+
+    links = pd.DataFrame({'_left': pairs[:, 0], '_right': pairs[:, 1], 'Score': scores})
+    links = links[links['Score'] >= threshold].sort_values(['_left', 'Score'], ascending=[True, False])
+    if keep == 'best':
+        links = links.drop_duplicates('_left')
+    return pd.DataFrame({
+        'Menu_Row': menus.index[links['_left']],
+        'COGS_Row': cogs.index[links['_right']],
+        'Menu_Dish': menus[menu_name].to_numpy()[links['_left']],
+        'COGS_Dish': cogs[cogs_name].to_numpy()[links['_right']],
+        'Score': links['Score'].to_numpy()
+    }, columns=columns).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Link menu dishes to COGS rows")
+    parser.add_argument('--menus', help="Menu CSV (default: the dataset store's combined menus)")
+    parser.add_argument('--threshold', type=float, default=0.35)
+    parser.add_argument('--all', action='store_true', help="Keep every link above the threshold")
+    parser.add_argument('--output', help="Write the links to this CSV")
+    args = parser.parse_args()
+
+    menus = pd.read_csv(args.menus) if args.menus else load_table('menus')
+    cogs = load_cogs_catalogue()
+    links = match_dishes(menus, cogs, threshold=args.threshold, keep='all' if args.all else 'best')
+
+    print(f"🔗 Linked {links['Menu_Row'].nunique()} of {len(menus)} menu dishes to COGS rows")
+    print(links.drop(columns=['Menu_Row', 'COGS_Row']).to_string(index=False))
+    if args.output:
+        links.to_csv(args.output, index=False)
+        print(f"📄 Output file: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
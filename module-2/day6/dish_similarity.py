@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Dish similarity - nearest-neighbour search over standardized COGS vectors.
+
+The COGS tables of all restaurants are aligned to one feature space
+(Meat/Sausage and Meat become Meat, ...), standardized and indexed with a
+KD-tree; for many features the index falls back to brute-force search,
+which is a single BLAS matrix product per query batch. Top-k queries take
+milliseconds even for catalogues of 10^6 dishes, and a batch of queries
+is answered in one call.
+
+Usage:
+    python dish_similarity.py                          # similar dishes for a Beef Steak
+    python dish_similarity.py --benchmark 1000000
+"""
+
+import argparse
+import re
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import NearestNeighbors
+
+from dataset_store import TABLES, load_table
+
+# Ingredient groups that the restaurants' COGS tables name differently
+COGS_ALIASES = {'Meat/Sausage': 'Meat', 'Pasta/Noodles': 'Pasta', 'Sauce/Cream': 'Sauce'}
+EXTRA_FEATURES = ['Estimated dish weight (kg)', 'Price_Numeric', 'Total COGS Estimated (CHF)']
+
+# Above this many features KD-tree pruning stops paying off
+KD_TREE_MAX_FEATURES = 20
+
+
+def cogs_feature_name(column: str) -> str:
+    """'COGS_Meat/Sausage (CHF)' -> 'COGS_Meat'"""
+    name = re.sub(r'\s*\(CHF\)$', '', column[len('COGS_'):])
+    return f"COGS_{COGS_ALIASES.get(name, name)}"
+
+
+def align_cogs(df: pd.DataFrame) -> pd.DataFrame:
+    """COGS columns renamed to the shared feature names (aliases summed)"""
+    cogs = df.filter(like='COGS_').T.groupby(cogs_feature_name).sum().T
+    return pd.concat([df.drop(columns=df.filter(like='COGS_').columns), cogs], axis=1)
+
+
+def load_cogs_catalogue(tables: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """All COGS tables in the dataset store on one set of columns (missing COGS are 0)"""
+    tables = tables or [name for name, spec in TABLES.items() if spec['kind'] == 'cogs']
+    frames = [align_cogs(load_table(name, columns=['Restaurant', 'Dish Name', 'COGS_*',
+                                                   *EXTRA_FEATURES, 'Healthiness']))
+              for name in tables]
+    catalogue = pd.concat(frames, ignore_index=True)
+    catalogue['Restaurant'] = catalogue['Restaurant'].astype('category')
+    cogs = sorted(column for column in catalogue.columns if column.startswith('COGS_'))
+    catalogue[cogs] = catalogue[cogs].fillna(0).astype('float32')
+    return catalogue
+
+
+class DishSimilarityIndex:
+    """
+    Nearest neighbours of dishes in standardized COGS feature space
+    features lists the numeric columns used; labels are returned with hits.
+    """
+
+    def __init__(self, catalogue: pd.DataFrame, features: Optional[Sequence[str]] = None,
+                 labels: Sequence[str] = ('Restaurant', 'Dish Name'), algorithm: str = 'auto'):
+        if features is None:
+            features = [c for c in catalogue.columns if c.startswith('COGS_')] + \
+                       [c for c in EXTRA_FEATURES if c in catalogue.columns]
+        self.features = list(features)
+        self.labels = catalogue[[label for label in labels if label in catalogue.columns]].reset_index(drop=True)
+
+        values = catalogue[self.features].to_numpy(dtype=np.float32)
+        self.mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+        self.scale = np.where(std > 0, std, 1.0).astype(np.float32)
+
+        if algorithm == 'auto':
+            algorithm = 'kd_tree' if len(self.features) <= KD_TREE_MAX_FEATURES else 'brute'
+        self.algorithm = algorithm
+        self._vectors = self.transform(values)
+        self._model = NearestNeighbors(algorithm=algorithm).fit(self._vectors)
+
+    def transform(self, values) -> np.ndarray:
+        """Standardize raw feature rows (array or frame with the index's features)"""
+        if isinstance(values, pd.DataFrame):
+            values = values.reindex(columns=self.features, fill_value=0.0).to_numpy(dtype=np.float32)
+        values = np.atleast_2d(np.asarray(values, dtype=np.float32))
+        return np.nan_to_num((values - self.mean) / self.scale)
+
+    def kneighbors(self, queries, k: int = 5):
+        """(distances, positions), each of shape (queries, k)"""
+        k = min(k, len(self.labels))
+        return self._model.kneighbors(self.transform(queries), n_neighbors=k)
+
+    def query(self, queries, k: int = 5) -> pd.DataFrame:
+        """
+        Top-k similar dishes for each query row, one result row per hit:
+        Query (position of the query), Rank, the label columns and Distance
+        """
+        return self._hits(*self.kneighbors(queries, k))
+
+    def similar_to(self, positions: Sequence[int], k: int = 5) -> pd.DataFrame:
+        """Top-k neighbours of dishes already in the index (the dish itself excluded)"""
+        positions = np.atleast_1d(positions)
+        distances, found = self._model.kneighbors(self._vectors[positions],
+                                                  n_neighbors=min(k + 1, len(self.labels)))
+        hits = self._hits(distances, found)
+        hits = hits[hits['Position'] != positions[hits['Query']]]
+        hits['Rank'] = hits.groupby('Query').cumcount() + 1
+        return hits[hits['Rank'] <= k].reset_index(drop=True)
+
+    def _hits(self, distances: np.ndarray, positions: np.ndarray) -> pd.DataFrame:
+        hits = self.labels.iloc[positions.ravel()].reset_index(drop=True)
+        hits.insert(0, 'Query', np.repeat(np.arange(len(positions)), positions.shape[1]))
+        hits.insert(1, 'Rank', np.tile(np.arange(1, positions.shape[1] + 1), len(positions)))
+        hits['Position'] = positions.ravel()
+        hits['Distance'] = distances.ravel()
+        return hits
+
+
+def benchmark(n_dishes: int, n_queries: int = 1000, k: int = 10, seed: int = 42) -> Dict[str, float]:
+    """Build and query an index over a synthetic catalogue resampled from the real one"""
+    import time
+
+    catalogue = load_cogs_catalogue()
+    rng = np.random.default_rng(seed)
+    index = DishSimilarityIndex(catalogue)
+    base = catalogue[index.features].to_numpy(dtype=np.float32)
+    synthetic = base[rng.integers(0, len(base), n_dishes)] * rng.lognormal(0, 0.2, (n_dishes, base.shape[1]))
+    synthetic = pd.DataFrame(synthetic.astype(np.float32), columns=index.features)
+    synthetic['Dish Name'] = np.arange(n_dishes).astype(str)
+
+    start = time.perf_counter()
+    big = DishSimilarityIndex(synthetic)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    big.kneighbors(synthetic[index.features].iloc[:n_queries], k)
+    elapsed = time.perf_counter() - start
+    return {'dishes': n_dishes, 'algorithm': big.algorithm, 'build_s': build,
+            'batch_ms': elapsed * 1000, 'per_query_ms': elapsed * 1000 / n_queries}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find similar dishes by COGS profile")
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--benchmark', type=int, metavar='N', help="Time queries on N synthetic dishes")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        result = benchmark(args.benchmark, k=args.k)
+        print(f"✅ {result['dishes']:,} dishes ({result['algorithm']}): built in {result['build_s']:.2f}s, "
+              f"1000 queries in {result['batch_ms']:.0f} ms ({result['per_query_ms']:.3f} ms/query)")
+        return
+
+    index = DishSimilarityIndex(load_cogs_catalogue())
+    beef_steak = pd.DataFrame([{'COGS_Meat': 15.0, 'COGS_Vegetables': 0.25,
+                                'Estimated dish weight (kg)': 0.4, 'Price_Numeric': 45,
+                                'Total COGS Estimated (CHF)': 15.25}])
+    print(f"🥩 Dishes most similar to a Beef Steak ({len(index.features)} features, {index.algorithm}):")
+    print(index.query(beef_steak, args.k).drop(columns=['Query', 'Position']).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,17 @@
 Simple script to display the KDE plot image
 """
 
+import os
 import matplotlib.pyplot as plt
 import matplotlib.image as mpimg
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 def display_kde_plot():
     """Display the generated KDE plot"""
     
     # Load and display the image
-    img_path = '/workspaces/cas-uzh/module-2/day6/restaurant_price_kde_comparison.png'
+    img_path = os.path.join(BASE_DIR, 'restaurant_price_kde_comparison.png')
     
     try:
         img = mpimg.imread(img_path)
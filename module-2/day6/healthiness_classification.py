@@ -16,31 +16,19 @@ from sklearn.svm import SVC
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score, roc_auc_score
 from sklearn.metrics import roc_curve, auc
 from sklearn.preprocessing import LabelBinarizer
-import re
 import warnings
 warnings.filterwarnings('ignore')
 
-def extract_numeric_price(price_str):
-    """Extract numeric price from price string."""
-    if pd.isna(price_str):
-        return None
-    
-    numbers = re.findall(r'\d+\.?\d*', str(price_str))
-    if numbers:
-        prices = [float(num) for num in numbers]
-        return sum(prices) / len(prices)
-    return None
+from dataset_store import load_table
 
 def create_healthiness_classification_model():
     """Create and evaluate probabilistic classification models for healthiness prediction."""
     
     # Load the data
-    df = pd.read_csv('zeughauskeller-cogs.csv')
+    df = load_table('zeughauskeller_cogs', columns=['Dish Name', 'COGS_*', 'Estimated dish weight (kg)', 'Price_Numeric',
+                                                     'Total COGS Estimated (CHF)', 'Healthiness'])
     print(f"📊 Dataset loaded: {len(df)} dishes")
     
-    # Extract numeric price
-    df['Price_Numeric'] = df['Price (CHF)'].apply(extract_numeric_price)
-    
     # Select features - COGS attributes plus other numerical features
     cogs_columns = [col for col in df.columns if col.startswith('COGS_')]
     feature_columns = cogs_columns + ['Estimated dish weight (kg)', 'Price_Numeric', 'Total COGS Estimated (CHF)']
@@ -7,85 +7,69 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
-import re
 from collections import Counter
 
-def extract_numeric_price(price_str):
-    """Extract numeric price from price string."""
-    if pd.isna(price_str):
-        return None
-    
-    # Extract all numbers from the price string
-    numbers = re.findall(r'\d+\.?\d*', str(price_str))
-    if numbers:
-        # If there are multiple prices (like "14.00 CHF (Klein) / 18.00 CHF (Groß)"), take the average
-        prices = [float(num) for num in numbers]
-        return sum(prices) / len(prices)
-    return None
+from ingredient_index import keyword_incidence
+from price_parser import parse_prices
+
+# Positive health factors (+points)
+POSITIVE_INGREDIENTS = {
+    'salad': 15, 'mixed salad': 15, 'green salad': 15, 'rucola': 10, 'arugula': 10,
+    'tomatoes': 8, 'cherry tomatoes': 8, 'vegetables': 12, 'seasonal ingredients': 10,
+    'herbs': 8, 'basilikum': 5, 'oregano': 5, 'garlic': 5, 'knoblauch': 5,
+    'chicken': 10, 'poulet': 10, 'veal': 8, 'perch': 12, 'fish': 12,
+    'olive oil': 8, 'potatoes': 6, 'boiled potatoes': 8
+}
+
+# Negative health factors (-points)
+NEGATIVE_INGREDIENTS = {
+    'cream': -8, 'rahm': -8, 'mascarpone': -10, 'gorgonzola': -6,
+    'bacon': -12, 'speck': -12, 'sausage': -10, 'bratwurst': -10, 'salsiccia': -10,
+    'fried': -8, 'deep fried': -12, 'butter': -6,
+    'bbq sauce': -5, 'barbecue sauce': -5, 'curry sauce': -5,
+    'french fries': -10, 'burger': -8, 'tartare': -5
+}
+
+# Category-based adjustments
+CATEGORY_ADJUSTMENTS = {
+    'salad': 15, 'insalate': 15, 'fresh salads': 15, 'light dishes': 12,
+    'soup': 8, 'homemade soups': 10,
+    'pizza': -5, 'pizze': -5, 'dessert': -15, 'dolci': -15
+}
+
+# Special dish type penalties/bonuses (keyword in the dish name)
+DISH_NAME_ADJUSTMENTS = {'pizza': -5, 'salad': 10}
 
 def calculate_healthiness_score(ingredients, dish_name, dish_category):
     """Calculate healthiness score based on ingredients and dish characteristics."""
-    if pd.isna(ingredients):
-        ingredients = ""
-    
-    ingredients_lower = ingredients.lower()
-    dish_lower = dish_name.lower()
-    category_lower = dish_category.lower()
-    
-    score = 50  # Base score
-    
-    # Positive health factors (+points)
-    positive_ingredients = {
-        'salad': 15, 'mixed salad': 15, 'green salad': 15, 'rucola': 10, 'arugula': 10,
-        'tomatoes': 8, 'cherry tomatoes': 8, 'vegetables': 12, 'seasonal ingredients': 10,
-        'herbs': 8, 'basilikum': 5, 'oregano': 5, 'garlic': 5, 'knoblauch': 5,
-        'chicken': 10, 'poulet': 10, 'veal': 8, 'perch': 12, 'fish': 12,
-        'olive oil': 8, 'potatoes': 6, 'boiled potatoes': 8
-    }
-    
-    # Negative health factors (-points)
-    negative_ingredients = {
-        'cream': -8, 'rahm': -8, 'mascarpone': -10, 'gorgonzola': -6,
-        'bacon': -12, 'speck': -12, 'sausage': -10, 'bratwurst': -10, 'salsiccia': -10,
-        'fried': -8, 'deep fried': -12, 'butter': -6,
-        'bbq sauce': -5, 'barbecue sauce': -5, 'curry sauce': -5,
-        'french fries': -10, 'burger': -8, 'tartare': -5
-    }
-    
-    # Category-based adjustments
-    category_adjustments = {
-        'salad': 15, 'insalate': 15, 'fresh salads': 15, 'light dishes': 12,
-        'soup': 8, 'homemade soups': 10,
-        'pizza': -5, 'pizze': -5, 'dessert': -15, 'dolci': -15
-    }
-    
-    # Apply positive factors
-    for ingredient, points in positive_ingredients.items():
-        if ingredient in ingredients_lower or ingredient in dish_lower:
-            score += points
-    
-    # Apply negative factors
-    for ingredient, points in negative_ingredients.items():
-        if ingredient in ingredients_lower or ingredient in dish_lower:
-            score += points
-    
-    # Apply category adjustments
-    for category, points in category_adjustments.items():
-        if category in category_lower:
-            score += points
-    
-    # Special dish type penalties/bonuses
-    if 'pizza' in dish_lower:
-        score -= 5
-    if 'dessert' in category_lower or 'tiramisu' in dish_lower:
-        score -= 20
-    if 'salad' in dish_lower:
-        score += 10
-    if 'soup' in dish_lower or 'broth' in dish_lower:
-        score += 8
+    row = pd.DataFrame({'Ingredients': [ingredients], 'Dish': [dish_name],
+                        'Dish Category': [dish_category]})
+    return int(calculate_healthiness_scores(row)[0])
+
+def calculate_healthiness_scores(df):
+    """
+    Healthiness scores for a whole menu frame as sparse keyword algebra:
+    keyword presence matrices (dishes x keywords) times the point vectors.
+    """
+    ingredient_keywords = {**POSITIVE_INGREDIENTS, **NEGATIVE_INGREDIENTS}
+    keyword_points = np.array([POSITIVE_INGREDIENTS.get(k, 0) + NEGATIVE_INGREDIENTS.get(k, 0)
+                               for k in ingredient_keywords])
+    
+    score = np.full(len(df), 50.0)  # Base score
+    score += keyword_incidence([df['Ingredients'], df['Dish']], ingredient_keywords) @ keyword_points
+    score += keyword_incidence([df['Dish Category']], CATEGORY_ADJUSTMENTS) @ \
+        np.array(list(CATEGORY_ADJUSTMENTS.values()))
+    score += keyword_incidence([df['Dish']], DISH_NAME_ADJUSTMENTS) @ \
+        np.array(list(DISH_NAME_ADJUSTMENTS.values()))
+    
+    # Desserts, soups and broths count once even if several keywords match
+    dessert = keyword_incidence([df['Dish Category']], ['dessert']) + keyword_incidence([df['Dish']], ['tiramisu'])
+    soup = keyword_incidence([df['Dish']], ['soup', 'broth'])
+    score -= 20 * (dessert.toarray().ravel() > 0)
+    score += 8 * (soup.toarray().any(axis=1))
     
     # Ensure score is within reasonable bounds
-    return max(0, min(100, score))
+    return np.clip(score, 0, 100).astype(int)
 
 def create_healthiness_cost_visualizations():
     """Create four distinct visualizations correlating healthiness and cost."""
@@ -94,16 +78,10 @@ def create_healthiness_cost_visualizations():
     df = pd.read_csv('combined_restaurant_menus.csv')
     
     # Extract numeric prices
-    df['Price_Numeric'] = df['Price'].apply(extract_numeric_price)
+    df['Price_Numeric'] = parse_prices(df['Price'])['Price_Numeric']
     
     # Calculate healthiness scores
-    df['Healthiness_Score'] = df.apply(
-        lambda row: calculate_healthiness_score(
-            row['Ingredients'], 
-            row['Dish'], 
-            row['Dish Category']
-        ), axis=1
-    )
+    df['Healthiness_Score'] = calculate_healthiness_scores(df)
     
     # Remove rows with missing price data
     df_clean = df.dropna(subset=['Price_Numeric'])
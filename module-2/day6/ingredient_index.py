@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Ingredient index - sparse dish x ingredient incidence matrix.
+
+Built once per dataset from the tokenized, normalized ingredients and
+saved next to the dataset store, the CSR matrix answers ingredient
+questions with sparse algebra instead of string scans:
+
+    dishes per ingredient   column sums (optionally per restaurant)
+    keyword scores          matrix @ weight vector
+    similar dishes          Jaccard similarity from matrix @ row.T
+
+Usage:
+    python ingredient_index.py                    # build / load the menus index
+    python ingredient_index.py --similar "Pizza Margherita"
+"""
+
+import argparse
+import os
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from dataset_store import DEFAULT_STORE_DIR, TABLES, BASE_DIR, load_table
+from digests import file_digest
+from ingredient_tokenizer import explode_ingredients
+
+# Bump when tokenization or the file layout changes, so saved indexes are rebuilt
+INDEX_VERSION = 1
+
+
+def keyword_incidence(texts: Sequence[pd.Series], keywords: Iterable[str]) -> sparse.csr_matrix:
+    """
+    Rows x keywords CSR matrix with 1 where a keyword occurs (as a substring,
+    case-insensitive) in any of the aligned text columns
+    """
+    keywords = list(keywords)
+    lowered = [text.fillna('').astype(str).str.lower() for text in texts]
+    columns = []
+    for keyword in keywords:
+        present = np.zeros(len(lowered[0]), dtype=bool)
+        for text in lowered:
+            present |= text.str.contains(keyword, regex=False).to_numpy()
+        columns.append(sparse.csr_matrix(present[:, None], dtype=np.int8))
+    if not columns:
+        return sparse.csr_matrix((len(lowered[0]), 0), dtype=np.int8)
+    return sparse.hstack(columns, format='csr')
+
+
+class IngredientIndex:
+    """
+    CSR incidence matrix (dishes x ingredients) with its row and column labels
+    dishes holds the key columns of each row; ingredients the column names.
+    """
+
+    def __init__(self, matrix: sparse.csr_matrix, dishes: pd.DataFrame, ingredients: pd.Index):
+        self.matrix = matrix.tocsr()
+        self.dishes = dishes.reset_index(drop=True)
+        self.ingredients = pd.Index(ingredients)
+
+    @classmethod
+    def from_menu(cls, df: pd.DataFrame, keys: Sequence[str] = ('Restaurant', 'Dish'),
+                  column: str = 'Ingredients') -> 'IngredientIndex':
+        """Tokenize and normalize a menu frame into an index"""
+        keys = [key for key in keys if key in df.columns]
+        positions = pd.DataFrame({key: df[key] for key in keys}).set_axis(range(len(df)))
+        exploded = explode_ingredients(df.set_axis(range(len(df))), keys=keys, column=column)
+        ingredient = exploded['Ingredient'].cat.remove_unused_categories()
+        matrix = sparse.csr_matrix(
+            (np.ones(len(exploded), dtype=np.int8),
+             (exploded.index.to_numpy(), ingredient.cat.codes.to_numpy())),
+            shape=(len(df), len(ingredient.cat.categories)))
+        matrix.sum_duplicates()
+        matrix.data[:] = 1                          # Presence, not repeat counts
+        return cls(matrix, positions, ingredient.cat.categories)
+
+    def save(self, path: str, digest: str = ''):
+        """Write the index as one compressed .npz (no pickled objects)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(
+            tmp, data=self.matrix.data, indices=self.matrix.indices, indptr=self.matrix.indptr,
+            shape=np.array(self.matrix.shape), ingredients=self.ingredients.to_numpy(dtype=str),
+            key_names=np.array(self.dishes.columns, dtype=str),
+            **{f"key_{i}": self.dishes[key].to_numpy(dtype=str)
+               for i, key in enumerate(self.dishes.columns)},
+            version=np.array(INDEX_VERSION), digest=np.array(digest))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, digest: Optional[str] = None) -> Optional['IngredientIndex']:
+        """Read a saved index; None if missing, outdated or not built from digest"""
+        try:
+            with np.load(path, allow_pickle=False) as saved:
+                if int(saved['version']) != INDEX_VERSION:
+                    return None
+                if digest is not None and str(saved['digest']) != digest:
+                    return None
+                matrix = sparse.csr_matrix((saved['data'], saved['indices'], saved['indptr']),
+                                           shape=tuple(saved['shape']))
+                dishes = pd.DataFrame({key: saved[f"key_{i}"]
+                                       for i, key in enumerate(saved['key_names'])})
+                return cls(matrix, dishes, pd.Index(saved['ingredients']))
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def contains(self, ingredient: str) -> np.ndarray:
+        """Boolean mask of dishes containing an ingredient"""
+        if ingredient not in self.ingredients:
+            return np.zeros(self.matrix.shape[0], dtype=bool)
+        return self.matrix[:, self.ingredients.get_loc(ingredient)].toarray().ravel() > 0
+
+    def dish_counts(self, by: Optional[str] = None) -> pd.Series:
+        """Dishes per ingredient, most common first (per group of the by key)"""
+        if by is None:
+            counts = np.asarray(self.matrix.sum(axis=0)).ravel()
+            return pd.Series(counts, index=self.ingredients).sort_values(ascending=False, kind='stable')
+        codes, groups = pd.factorize(self.dishes[by])
+        membership = sparse.csr_matrix((np.ones(len(codes)), (codes, np.arange(len(codes)))),
+                                       shape=(len(groups), len(codes)))
+        counts = (membership @ self.matrix).toarray().astype(int)
+        table = pd.DataFrame(counts, index=groups, columns=self.ingredients)
+        return table.stack().loc[lambda s: s > 0].sort_values(ascending=False, kind='stable')
+
+    def score(self, weights: Dict[str, float]) -> np.ndarray:
+        """Sum of ingredient weights per dish (ingredients not in the index are ignored)"""
+        vector = pd.Series(weights, dtype=float).reindex(self.ingredients, fill_value=0.0)
+        return self.matrix @ vector.to_numpy()
+
+    def similar(self, row: int, top: int = 5) -> pd.DataFrame:
+        """Dishes sharing the most ingredients with one dish (Jaccard similarity)"""
+        shared = np.asarray((self.matrix @ self.matrix[row].T).todense()).ravel()
+        sizes = np.asarray(self.matrix.sum(axis=1)).ravel()
+        union = sizes + sizes[row] - shared
+        jaccard = np.divide(shared, union, out=np.zeros(len(shared)), where=union > 0)
+        jaccard[row] = -1.0
+        order = np.argsort(-jaccard, kind='stable')[:top]
+        result = self.dishes.iloc[order].copy()
+        result['Shared'] = shared[order].astype(int)
+        result['Jaccard'] = jaccard[order]
+        return result
+
+
+def load_ingredient_index(table: str = 'menus', store_dir: str = DEFAULT_STORE_DIR) -> IngredientIndex:
+    """Index of a dataset store table, rebuilt only when its source CSV changes"""
+    digest = file_digest(os.path.join(BASE_DIR, TABLES[table]['source']))
+    path = os.path.join(store_dir, f"{table}_ingredients.npz")
+    index = IngredientIndex.load(path, digest)
+    if index is None:
+        index = IngredientIndex.from_menu(load_table(table, columns=['Restaurant', 'Dish', 'Ingredients']))
+        index.save(path, digest)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the dish x ingredient index")
+    parser.add_argument('--table', default='menus')
+    parser.add_argument('--similar', metavar='DISH', help="Show dishes similar to this one")
+    parser.add_argument('--top', type=int, default=5)
+    args = parser.parse_args()
+
+    index = load_ingredient_index(args.table)
+    print(f"✅ {index.matrix.shape[0]} dishes x {index.matrix.shape[1]} ingredients, "
+          f"{index.matrix.nnz} entries ({index.matrix.nnz / max(1, np.prod(index.matrix.shape)):.1%} dense)")
+
+    if args.similar:
+        rows = np.flatnonzero(index.dishes['Dish'].str.lower() == args.similar.lower())
+        if len(rows) == 0:
+            raise SystemExit(f"Unknown dish: {args.similar}")
+        print(f"\n🍽️  Dishes similar to {args.similar}:")
+        print(index.similar(rows[0], args.top).to_string(index=False))
+    else:
+        print(f"\n{index.dish_counts(by='Restaurant').head(10).to_string()}")
+
+
+if __name__ == "__main__":
+    main()
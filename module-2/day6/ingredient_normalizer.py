@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Ingredient normalizer - map German, Italian and English ingredient names
+to one canonical name ('büffelmozzarella' -> 'mozzarella').
+
+The synonym map is compiled once into an Aho-Corasick automaton, so an
+ingredient is scanned a single time whatever the size of the map, and the
+longest synonym found in it wins ('cherry tomatoes' before 'tomatoes',
+'potato salad' before 'salad'); among equally long synonyms the leftmost
+one wins. The result never depends on the order of the map.
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+SYNONYMS = {
+    # Cheese variations
+    'mozzarella': 'mozzarella',
+    'büffelmozzarella': 'mozzarella',
+    'buffalo mozzarella': 'mozzarella',
+    'gorgonzola': 'gorgonzola',
+    'mascarpone': 'mascarpone',
+    'grana': 'grana/parmesan',
+    'parmesan': 'grana/parmesan',
+    'gruyère': 'gruyère',
+    'swiss gruyère cheese': 'gruyère',
+    'swiss cheese': 'gruyère',
+    'provola': 'provola',
+    'burrata': 'burrata',
+
+    # Tomato variations
+    'tomaten': 'tomatoes',
+    'tomatoes': 'tomatoes',
+    'tomatensauce': 'tomatoes',
+    'tomato sauce': 'tomatoes',
+    'tomatenwürfel': 'tomatoes',
+    'tomato cubes': 'tomatoes',
+    'tomatenscheiben': 'tomatoes',
+    'cherry': 'cherry tomatoes',
+    'cherry tomatoes': 'cherry tomatoes',
+
+    # Meat variations
+    'hinterschinken': 'ham',
+    'ham': 'ham',
+    'prosciutto': 'ham',
+    'rohschinken': 'prosciutto',
+    'speck': 'bacon',
+    'bacon': 'bacon',
+    'salami scharf': 'spicy salami',
+    'salami mild': 'mild salami',
+    'salsiccia': 'sausage',
+    'sausage': 'sausage',
+    'veal': 'veal',
+    'kalbsgeschnetzeltes': 'veal',
+    'kalbs': 'veal',
+    'beef': 'beef',
+    'rindscarpaccio': 'beef carpaccio',
+    'rinds': 'beef',
+    'rind': 'beef',
+    'pork': 'pork',
+    'chicken': 'chicken',
+    'poulet': 'chicken',
+    'pouletstreifen': 'chicken',
+    'swiss gourmet chicken': 'chicken',
+
+    # Vegetables
+    'rucola': 'arugula',
+    'arugula': 'arugula',
+    'spinat': 'spinach',
+    'spinach': 'spinach',
+    'zwiebeln': 'onions',
+    'onions': 'onions',
+    'knoblauch': 'garlic',
+    'garlic': 'garlic',
+    'champignons': 'mushrooms',
+    'mushrooms': 'mushrooms',
+    'frische champignons': 'mushrooms',
+    'steinpilze': 'porcini mushrooms',
+    'peperoni': 'peppers',
+    'peppers': 'peppers',
+    'zucchetti': 'zucchini',
+    'zucchini': 'zucchini',
+    'auberginen': 'eggplant',
+    'eggplant': 'eggplant',
+
+    # Herbs and seasonings
+    'oregano': 'oregano',
+    'basilikum': 'basil',
+    'basil': 'basil',
+    'peperoncino': 'chili',
+    'chili': 'chili',
+    'herbs': 'herbs',
+    'kräuter': 'herbs',
+
+    # Sauces and creams
+    'rahm': 'cream',
+    'cream': 'cream',
+    'cream sauce': 'cream sauce',
+    'creamy white-wine sauce': 'wine cream sauce',
+    'onion sauce': 'onion sauce',
+    'tartar sauce': 'tartar sauce',
+    'rindsbolognesesauce': 'bolognese sauce',
+    'bolognese sauce': 'bolognese sauce',
+
+    # Carbs and sides
+    'potato': 'potatoes',
+    'potatoes': 'potatoes',
+    'kartoffeln': 'potatoes',
+    'potato salad': 'potato salad',
+    'homemade potato salad': 'potato salad',
+    'rösti': 'rösti',
+    'french fries': 'french fries',
+    'noodles': 'pasta',
+    'pasta': 'pasta',
+    'macaroni': 'pasta',
+    'rice': 'rice',
+    'bread': 'bread',
+    'toast': 'toast',
+    'butter': 'butter',
+
+    # Salad ingredients
+    'gemischter blattsalat': 'mixed salad',
+    'mixed salad': 'mixed salad',
+    'mixed green salad': 'mixed salad',
+    'green salad': 'salad',
+    'salad': 'salad',
+    'salad garnish': 'salad',
+
+    # Seafood
+    'perch fillets': 'perch',
+    'perch': 'perch',
+
+    # Other
+    'ei': 'egg',
+    'egg': 'egg',
+    'oliven': 'olives',
+    'olives': 'olives',
+    'safran': 'saffron',
+    'saffron': 'saffron',
+    'schwarzer trüffel': 'black truffle',
+    'black truffle': 'black truffle',
+    'wine': 'wine',
+    'white wine': 'wine',
+    'coleslaw': 'coleslaw',
+    'bbq-sauce': 'bbq sauce',
+    'fried onions': 'onions',
+    'dark draught beer': 'beer',
+    'seasonal ingredients': 'seasonal ingredients'
+}
+
+# Preparations and garnish words that are not ingredients on their own
+IGNORED_INGREDIENTS = {'geröstete brotscheibe', 'boiled', 'pan fried', 'crumbed', 'crispy', 'grilled'}
+
+
+class IngredientNormalizer:
+    """
+    Aho-Corasick automaton over the synonym map
+    Each state stores the longest synonym ending there (following failure
+    links), so one pass over a text finds its longest synonym.
+    """
+
+    def __init__(self, synonyms: Dict[str, str] = SYNONYMS,
+                 ignored: Iterable[str] = IGNORED_INGREDIENTS):
+        self.ignored = set(ignored)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[Optional[Tuple[int, str]]] = [None]
+        for synonym, canonical in synonyms.items():
+            key = synonym.strip().lower()
+            state = 0
+            for char in key:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._output.append(None)
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state] = (len(key), canonical)
+        self._fail = [0] * len(self._goto)
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        """Breadth-first, so a state's failure target is finished before it"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # A synonym ending here is longer than any suffix reached by failure
+                if self._output[child] is None:
+                    self._output[child] = self._output[self._fail[child]]
+                queue.append(child)
+
+    def longest_match(self, text: str) -> Optional[Tuple[int, int, str]]:
+        """(start, end, canonical) of the longest synonym in text, leftmost on ties"""
+        best = None
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            output = self._output[state]
+            if output and (best is None or output[0] > best[1] - best[0]):
+                best = (position + 1 - output[0], position + 1, output[1])
+        return best
+
+    def normalize(self, ingredient: str) -> Optional[str]:
+        """Canonical name, the cleaned ingredient when no synonym matches, or None"""
+        ingredient = ingredient.strip().lower()
+        if ingredient in self.ignored:
+            return None
+        match = self.longest_match(ingredient)
+        if match:
+            return match[2]
+        if len(ingredient) > 2:
+            return ingredient
+        return None
+
+    def normalize_column(self, ingredients: pd.Series) -> pd.Series:
+        """Normalize a column of single ingredients; each distinct value is scanned once"""
+        codes, uniques = pd.factorize(ingredients.astype('string').str.strip().str.lower())
+        # Missing values have code -1 and pick the trailing None
+        normalized = np.array([self.normalize(text) for text in uniques] + [None], dtype=object)
+        return pd.Series(normalized[codes], index=ingredients.index, name=ingredients.name)
+
+
+@lru_cache(maxsize=None)
+def default_normalizer() -> IngredientNormalizer:
+    """The normalizer for SYNONYMS, compiled on first use"""
+    return IngredientNormalizer()
+
+
+if __name__ == "__main__":
+    samples = pd.Series(['Büffelmozzarella', 'Cherry tomatoes', 'homemade potato salad',
+                         'Rindsbolognesesauce', 'Tomatensauce', 'grilled', 'polenta', None])
+    print(pd.DataFrame({'Ingredient': samples,
+                        'Normalized': default_normalizer().normalize_column(samples)}).to_string(index=False))
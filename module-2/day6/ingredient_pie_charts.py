@@ -4,202 +4,32 @@ Create pie charts showing the proportion of dishes containing each ingredient
 for Zeughauskeller and La Fonte restaurants
 """
 
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-import re
-from collections import Counter
+
+from ingredient_normalizer import default_normalizer
+from ingredient_tokenizer import explode_ingredients, tokenize_ingredients
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 def clean_and_extract_ingredients(ingredients_str):
     """Clean and extract individual ingredients from ingredient strings"""
     if pd.isna(ingredients_str):
         return []
-    
-    # Convert to lowercase for consistency
-    ingredients_str = str(ingredients_str).lower()
-    
-    # Remove common non-ingredient words and punctuation
-    ingredients_str = re.sub(r'[(),"]', '', ingredients_str)
-    ingredients_str = re.sub(r'\b(served with|garnished with|made in|according to|recipe from|for|persons|specialty|hausgemacht|homemade|und|and|with|fresh|frisch)\b', '', ingredients_str)
-    
-    # Split by common separators
-    ingredients = re.split(r'[,;]', ingredients_str)
-    
-    # Clean each ingredient
-    cleaned_ingredients = []
-    for ingredient in ingredients:
-        ingredient = ingredient.strip()
-        if len(ingredient) > 2 and ingredient not in ['chf', 'klein', 'groß', 'regular', 'portion', 'oder', 'or', 'also']:
-            # Standardize common ingredient names
-            ingredient = standardize_ingredient_name(ingredient)
-            if ingredient:
-                cleaned_ingredients.append(ingredient)
-    
-    return cleaned_ingredients
+    return list(tokenize_ingredients(str(ingredients_str)))
 
 def standardize_ingredient_name(ingredient):
-    """Standardize ingredient names for consistent counting"""
-    
-    ingredient = ingredient.strip().lower()
-    
-    # Dictionary for ingredient standardization
-    standardization_map = {
-        # Cheese variations
-        'mozzarella': 'mozzarella',
-        'büffelmozzarella': 'mozzarella',
-        'buffalo mozzarella': 'mozzarella',
-        'gorgonzola': 'gorgonzola', 
-        'mascarpone': 'mascarpone',
-        'grana': 'grana/parmesan',
-        'parmesan': 'grana/parmesan',
-        'gruyère': 'gruyère',
-        'swiss gruyère cheese': 'gruyère',
-        'swiss cheese': 'gruyère',
-        'provola': 'provola',
-        'burrata': 'burrata',
-        
-        # Tomato variations
-        'tomaten': 'tomatoes',
-        'tomatoes': 'tomatoes',
-        'tomatensauce': 'tomatoes',
-        'tomato sauce': 'tomatoes',
-        'tomatenwürfel': 'tomatoes',
-        'tomato cubes': 'tomatoes',
-        'tomatenscheiben': 'tomatoes',
-        'cherry': 'cherry tomatoes',
-        'cherry tomatoes': 'cherry tomatoes',
-        
-        # Meat variations
-        'hinterschinken': 'ham',
-        'ham': 'ham',
-        'prosciutto': 'ham',
-        'rohschinken': 'prosciutto',
-        'speck': 'bacon',
-        'bacon': 'bacon',
-        'salami scharf': 'spicy salami',
-        'salami mild': 'mild salami',
-        'salsiccia': 'sausage',
-        'sausage': 'sausage',
-        'veal': 'veal',
-        'kalbsgeschnetzeltes': 'veal',
-        'kalbs': 'veal',
-        'beef': 'beef',
-        'rindscarpaccio': 'beef carpaccio',
-        'rinds': 'beef',
-        'rind': 'beef',
-        'pork': 'pork',
-        'chicken': 'chicken',
-        'poulet': 'chicken',
-        'pouletstreifen': 'chicken',
-        'swiss gourmet chicken': 'chicken',
-        
-        # Vegetables
-        'rucola': 'arugula',
-        'arugula': 'arugula',
-        'spinat': 'spinach',
-        'spinach': 'spinach',
-        'zwiebeln': 'onions',
-        'onions': 'onions',
-        'knoblauch': 'garlic',
-        'garlic': 'garlic',
-        'champignons': 'mushrooms',
-        'mushrooms': 'mushrooms',
-        'frische champignons': 'mushrooms',
-        'steinpilze': 'porcini mushrooms',
-        'peperoni': 'peppers',
-        'peppers': 'peppers',
-        'zucchetti': 'zucchini',
-        'zucchini': 'zucchini',
-        'auberginen': 'eggplant',
-        'eggplant': 'eggplant',
-        
-        # Herbs and seasonings
-        'oregano': 'oregano',
-        'basilikum': 'basil',
-        'basil': 'basil',
-        'peperoncino': 'chili',
-        'chili': 'chili',
-        'herbs': 'herbs',
-        'kräuter': 'herbs',
-        
-        # Sauces and creams
-        'rahm': 'cream',
-        'cream': 'cream',
-        'cream sauce': 'cream sauce',
-        'creamy white-wine sauce': 'wine cream sauce',
-        'onion sauce': 'onion sauce',
-        'tartar sauce': 'tartar sauce',
-        'rindsbolognesesauce': 'bolognese sauce',
-        'bolognese sauce': 'bolognese sauce',
-        
-        # Carbs and sides
-        'potato': 'potatoes',
-        'potatoes': 'potatoes',
-        'kartoffeln': 'potatoes',
-        'potato salad': 'potato salad',
-        'homemade potato salad': 'potato salad',
-        'rösti': 'rösti',
-        'french fries': 'french fries',
-        'noodles': 'pasta',
-        'pasta': 'pasta',
-        'macaroni': 'pasta',
-        'rice': 'rice',
-        'bread': 'bread',
-        'toast': 'toast',
-        'butter': 'butter',
-        
-        # Salad ingredients
-        'gemischter blattsalat': 'mixed salad',
-        'mixed salad': 'mixed salad',
-        'mixed green salad': 'mixed salad',
-        'green salad': 'salad',
-        'salad': 'salad',
-        'salad garnish': 'salad',
-        
-        # Seafood
-        'perch fillets': 'perch',
-        'perch': 'perch',
-        
-        # Other
-        'ei': 'egg',
-        'egg': 'egg',
-        'oliven': 'olives',
-        'olives': 'olives',
-        'safran': 'saffron',
-        'saffron': 'saffron',
-        'schwarzer trüffel': 'black truffle',
-        'black truffle': 'black truffle',
-        'wine': 'wine',
-        'white wine': 'wine',
-        'coleslaw': 'coleslaw',
-        'bbq-sauce': 'bbq sauce',
-        'fried onions': 'onions',
-        'dark draught beer': 'beer',
-        'seasonal ingredients': 'seasonal ingredients'
-    }
-    
-    # Check for exact matches first
-    for key, value in standardization_map.items():
-        if key == ingredient or key in ingredient:
-            return value
-    
-    # If no match found, return cleaned version if it's substantive
-    if len(ingredient) > 2 and ingredient not in ['geröstete brotscheibe', 'boiled', 'pan fried', 'crumbed', 'crispy', 'grilled']:
-        return ingredient
-    
-    return None
+    """Standardize ingredient names for consistent counting (longest synonym match)"""
+    return default_normalizer().normalize(ingredient)
 
 def analyze_ingredients(df, restaurant_name):
     """Analyze ingredient frequency for a restaurant"""
     
-    all_ingredients = []
-    
-    for _, row in df.iterrows():
-        ingredients = clean_and_extract_ingredients(row['Ingredients'])
-        all_ingredients.extend(ingredients)
-    
-    # Count ingredient frequency
-    ingredient_counts = Counter(all_ingredients)
+    # Count ingredient occurrences (an ingredient listed twice in a dish counts twice)
+    exploded = explode_ingredients(df)
+    ingredient_counts = exploded['Ingredient'].astype(str).value_counts(sort=False).to_dict()
     
     # Filter out very rare ingredients (appear in less than 2 dishes) for cleaner visualization
     min_frequency = 1  # Changed to 1 to show more ingredients
@@ -216,8 +46,8 @@ def create_ingredient_pie_charts():
     """Create pie charts for both restaurants showing ingredient proportions"""
     
     # Load data
-    la_fonte_df = pd.read_csv('/workspaces/cas-uzh/module-2/day6/la_fonte_menu_dishes.csv')
-    zeughaus_df = pd.read_csv('/workspaces/cas-uzh/module-2/day6/zeughauskeller_menu_dishes.csv')
+    la_fonte_df = pd.read_csv(os.path.join(BASE_DIR, 'la_fonte_menu_dishes.csv'))
+    zeughaus_df = pd.read_csv(os.path.join(BASE_DIR, 'zeughauskeller_menu_dishes.csv'))
     
     # Analyze ingredients
     la_fonte_ingredients = analyze_ingredients(la_fonte_df, 'La Fonte')
@@ -349,7 +179,7 @@ def main():
     fig, la_fonte_ingredients, zeughaus_ingredients = create_ingredient_pie_charts()
     
     # Save the plot
-    output_path = '/workspaces/cas-uzh/module-2/day6/restaurant_ingredient_pie_charts.png'
+    output_path = os.path.join(BASE_DIR, 'restaurant_ingredient_pie_charts.png')
     fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
     print(f"Ingredient pie charts saved to: {output_path}")
     
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Ingredient tokenizer - split menu ingredient text into normalized
+ingredients and explode whole menus into a flat (dish, ingredient) table.
+
+Ingredient strings repeat a lot across dishes and restaurants, so a column
+is deduplicated first and each distinct string is tokenized once; results
+are memoized in a bounded LRU that is shared across calls.
+"""
+
+import re
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ingredient_normalizer import default_normalizer
+
+_PUNCTUATION = re.compile(r'[()"]')
+_FILLER_WORDS = re.compile(
+    r'\b(served with|garnished with|made in|according to|recipe from|for|persons|specialty|'
+    r'hausgemacht|homemade|und|and|with|fresh|frisch)\b')
+_SEPARATORS = re.compile(r'[,;]')
+_WHITESPACE = re.compile(r'\s+')
+
+# Leftovers of prices, portions and alternatives
+STOP_TOKENS = {'chf', 'klein', 'groß', 'regular', 'portion', 'oder', 'or', 'also'}
+
+TOKEN_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def tokenize_ingredients(text: str) -> Tuple[str, ...]:
+    """Normalized ingredients of one ingredient string, in menu order"""
+    text = _FILLER_WORDS.sub('', _PUNCTUATION.sub('', text.lower()))
+    normalizer = default_normalizer()
+    tokens = []
+    for part in _SEPARATORS.split(text):
+        part = _WHITESPACE.sub(' ', part).strip()
+        if len(part) > 2 and part not in STOP_TOKENS:
+            ingredient = normalizer.normalize(part)
+            if ingredient:
+                tokens.append(ingredient)
+    return tuple(tokens)
+
+
+def explode_ingredients(df: pd.DataFrame, keys: Sequence[str] = ('Dish',),
+                        column: str = 'Ingredients') -> pd.DataFrame:
+    """
+    One row per (dish, ingredient): the key columns plus 'Ingredient'
+    The index of df is kept (repeated per ingredient), like DataFrame.explode;
+    dishes without ingredients are dropped. 'Ingredient' is categorical.
+    """
+    codes, uniques = pd.factorize(df[column].astype('string'))
+    token_lists = [tokenize_ingredients(str(text)) for text in uniques] + [()]
+    categories = pd.Index(sorted({token for tokens in token_lists for token in tokens}))
+    flat_tokens = categories.get_indexer([token for tokens in token_lists for token in tokens])
+    sizes = np.array([len(tokens) for tokens in token_lists])
+    starts = np.cumsum(sizes) - sizes
+
+    # Row r with distinct string c takes flat_tokens[starts[c]:starts[c] + sizes[c]]
+    lengths = sizes[codes]
+    rows = np.repeat(np.arange(len(df)), lengths)
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    ingredient_codes = flat_tokens[starts[codes][rows] + offsets]
+
+    exploded = df.iloc[rows][list(keys)].copy()
+    exploded['Ingredient'] = pd.Categorical.from_codes(ingredient_codes, categories)
+    return exploded
+
+
+def dishes_per_ingredient(exploded: pd.DataFrame, by: Sequence[str] = ()) -> pd.Series:
+    """Number of dishes containing each ingredient (optionally per group)"""
+    dish_ingredients = exploded.reset_index().drop_duplicates(
+        subset=[exploded.index.name or 'index', *by, 'Ingredient'])
+    return dish_ingredients.groupby([*by, 'Ingredient'], observed=True).size().sort_values(ascending=False)
+
+
+if __name__ == "__main__":
+    import time
+
+    menus = pd.read_csv('combined_restaurant_menus.csv')
+    exploded = explode_ingredients(menus, keys=['Restaurant', 'Dish'])
+    print(exploded.head(10).to_string())
+    print(f"\n{dishes_per_ingredient(exploded).head(10).to_string()}")
+
+    large = menus.sample(1000000, replace=True, random_state=42).reset_index(drop=True)
+    start = time.perf_counter()
+    exploded = explode_ingredients(large, keys=['Restaurant'])
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ {len(large):,} menu rows -> {len(exploded):,} ingredient rows in {elapsed:.2f}s "
+          f"({tokenize_ingredients.cache_info().currsize} distinct strings tokenized)")
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Generic menu extractor - parse restaurant menu PDFs into the
+Restaurant, ID, Dish, Dish Category, Ingredients, Price schema.
+
+Each restaurant is described by a declarative layout config (which pages
+to read and how to recognise category headers, dish lines, ingredient
+lines, ...) instead of a hand-written script. Pages are extracted and
+classified in parallel, so onboarding a new menu means adding a config.
+"""
+
+import argparse
+import json
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pdfplumber
+
+from page_cache import DEFAULT_CACHE_DIR, PageCache, extract_page
+
+MENU_COLUMNS = ['Restaurant', 'ID', 'Dish', 'Dish Category', 'Ingredients', 'Price']
+
+# Layout configs. Rules are tried in order and the first match decides a
+# line's role; a rule matches on font size (size / min_size / max_size),
+# font name (regex) and text (regex with named groups).
+#   category     - starts a new dish category
+#   dish         - a dish with (?P<dish>...) and (?P<prices>...)
+#   ingredients  - ingredients of the previous dish, (?P<ingredients>...)
+#   title        - heading shared by the variant dishes that follow it
+#   description  - free text describing the previous dish (or title)
+#   skip         - notes, surcharges, ...
+# Lines matching no rule are ignored.
+MENU_LAYOUTS = {
+    'la_fonte': {
+        'restaurant': 'La Fonte Restaurant Pizzeria',
+        'pdf': '01_lafonterestaurantpizzeria_speisekarte.pdf',
+        'pages': [2, 3, 4, 5, 6, 7],
+        'decimal': ',',
+        'price_labels': ['Klein', 'Groß'],
+        'rules': [
+            {'role': 'category', 'min_size': 30},
+            {'role': 'dish', 'min_size': 16, 'max_size': 22,
+             'pattern': r'^(?P<dish>.+?)[\s)]+(?P<prices>\d+,\d{2}(?:\s+\d+,\d{2})*)$'},
+            {'role': 'ingredients', 'size': 12, 'pattern': r'^\((?P<ingredients>[^)]*)\)?'}
+        ],
+        'id_prefixes': {
+            'Antipasti': 'A', 'Insalate': 'S', 'Contorni': 'CO', 'Primi Piatti': 'P',
+            'Gnocchi Hausgemacht': 'G', 'Pizze Classiche': 'PC', 'Pizze Speciali': 'PS',
+            'Il Nostro Calzone': 'C', 'Glutenfreie Pizza': 'GF', 'I nostri Dessert': 'D',
+            'I nostri Gelati': 'GE'
+        },
+        'dish_prefixes': {
+            'Pizze Classiche': 'Pizza', 'Pizze Speciali': 'Pizza', 'Gnocchi Hausgemacht': 'Gnocchi'
+        }
+    },
+    'zeughauskeller': {
+        'restaurant': 'Zeughauskeller Zurich',
+        'pdf': '01_Zeughauskeller_Menu.pdf',
+        'pages': [2, 3, 4, 5],
+        'decimal': '.',
+        'variant_pattern': r'^[a-z]',
+        'rules': [
+            {'role': 'skip',
+             'pattern': r'^(?:\d+\s+)?(?:Tip:|Alternatively|Choice of|On request|To share|Add a portion)'},
+            {'role': 'category', 'min_size': 16, 'pattern': r'^[A-Z]'},
+            {'role': 'dish', 'max_size': 11.5,
+             'pattern': r'^(?:(?P<number>\d+)\s+)?(?P<dish>.+?)\s+(?P<prices>\d+\.\d{2}(?:\s+\d+\.\d{2})*)$'},
+            {'role': 'title', 'font': 'Bold', 'max_size': 11.5},
+            {'role': 'description', 'max_size': 11.5}
+        ],
+        'id_prefixes': {
+            'Homemade Soups': 'S', 'Fresh Salads': 'SA', 'Cold Platters': 'CP',
+            'Specialities of the House': 'SH', 'Our Sausage Favourites': 'SF',
+            'Always a good choice': 'AG', 'Light dishes': 'LD'
+        }
+    }
+}
+
+
+def extract_page_lines(pdf_path: str, page_number: int,
+                       cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> List[Dict]:
+    """Text lines of one page (1-based) with their dominant font, size and position"""
+    if cache_dir:
+        return PageCache(cache_dir).page(pdf_path, page_number)['lines']
+    with pdfplumber.open(pdf_path) as pdf:
+        return extract_page(pdf.pages[page_number - 1])['lines']
+
+
+def _rule_matches(rule: Dict, line: Dict) -> Optional[Dict]:
+    """Named groups of a matching rule ({} without a pattern), or None"""
+    size = line['size']
+    if 'size' in rule and abs(size - rule['size']) > 0.5:
+        return None
+    if size < rule.get('min_size', 0) or size > rule.get('max_size', float('inf')):
+        return None
+    if 'font' in rule and not re.search(rule['font'], line['font']):
+        return None
+    if 'pattern' not in rule:
+        return {}
+    match = re.search(rule['pattern'], line['text'])
+    return match.groupdict() if match else None
+
+
+def classify_lines(lines: List[Dict], layout: Dict) -> List[Dict]:
+    """Assign each line its role under the layout's rules"""
+    tokens = []
+    for line in lines:
+        for rule in layout['rules']:
+            groups = _rule_matches(rule, line)
+            if groups is not None:
+                if rule['role'] != 'skip':
+                    tokens.append({'role': rule['role'], 'text': line['text'], **groups})
+                break
+    return tokens
+
+
+def _classify_page(task):
+    """Worker: extract and classify one page"""
+    name, layout, pdf_path, page_number, cache_dir = task
+    lines = extract_page_lines(pdf_path, page_number, cache_dir)
+    return name, page_number, classify_lines(lines, layout)
+
+
+def format_price(prices: str, layout: Dict) -> str:
+    """'14,00 18,00' -> '14.00 CHF (Klein) / 18.00 CHF (Groß)'"""
+    amounts = [p.replace(layout.get('decimal', '.'), '.') for p in prices.split()]
+    labels = layout.get('price_labels', [])
+    if len(amounts) == 1 or len(amounts) != len(labels):
+        return ' / '.join(f"{amount} CHF" for amount in amounts)
+    return ' / '.join(f"{amount} CHF ({label})" for amount, label in zip(amounts, labels))
+
+
+def _id_prefix(category: str, layout: Dict) -> str:
+    """Configured ID prefix, or the category's initials"""
+    prefixes = layout.get('id_prefixes', {})
+    if category in prefixes:
+        return prefixes[category]
+    return ''.join(word[0] for word in category.split() if word[0].isalnum()).upper() or 'X'
+
+
+def assemble_dishes(tokens: List[Dict], layout: Dict) -> List[Dict]:
+    """Turn the classified lines of a whole menu (in page order) into dish rows"""
+    dishes = []
+    counters = defaultdict(int)
+    category, title, title_text, current = None, None, '', None
+    variant = re.compile(layout['variant_pattern']) if layout.get('variant_pattern') else None
+
+    for token in tokens:
+        role = token['role']
+        if role == 'category':
+            category, title, current = token['text'], None, None
+        elif role == 'title':
+            title, title_text, current = token['text'], '', None
+        elif role == 'dish' and category:
+            name = token['dish'].strip()
+            if title and variant and variant.search(name):
+                ingredients = title_text
+                name = f"{title} - {name}"
+            else:
+                title, ingredients = None, ''
+                prefix = layout.get('dish_prefixes', {}).get(category)
+                if prefix:
+                    name = f"{prefix} {name}"
+            prefix = _id_prefix(category, layout)
+            counters[prefix] += 1
+            current = {
+                'Restaurant': layout['restaurant'],
+                'ID': f"{prefix}{counters[prefix]:03d}",
+                'Dish': name,
+                'Dish Category': category,
+                'Ingredients': ingredients,
+                'Price': format_price(token['prices'], layout)
+            }
+            dishes.append(current)
+        elif role in ('ingredients', 'description'):
+            text = (token.get('ingredients') or token['text']).strip()
+            if current is not None:
+                current['Ingredients'] = f"{current['Ingredients']} {text}".strip()
+            elif title:
+                title_text = f"{title_text} {text}".strip()
+    return dishes
+
+
+def extract_menus(layouts: Dict[str, Dict], base_dir: str = '.',
+                  max_workers: Optional[int] = None,
+                  cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> pd.DataFrame:
+    """
+    Extract every configured menu; all pages of all menus are processed in
+    parallel, then each menu is assembled in page order. Page text comes
+    from the page cache when cache_dir is set (None always re-extracts).
+    """
+    tasks = [
+        (name, layout, os.path.join(base_dir, layout['pdf']), page, cache_dir)
+        for name, layout in layouts.items() for page in layout['pages']
+    ]
+    pages = defaultdict(dict)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for name, page_number, tokens in pool.map(_classify_page, tasks):
+            pages[name][page_number] = tokens
+
+    rows = []
+    for name, layout in layouts.items():
+        tokens = [token for page in layout['pages'] for token in pages[name][page]]
+        rows.extend(assemble_dishes(tokens, layout))
+    return pd.DataFrame(rows, columns=MENU_COLUMNS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract dishes from restaurant menu PDFs")
+    parser.add_argument('--layouts', help="JSON file with additional layout configs")
+    parser.add_argument('--only', nargs='+', help="Layout names to extract")
+    parser.add_argument('--output', default='extracted_restaurant_menus.csv')
+    parser.add_argument('--workers', type=int, help="Parallel page workers")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="Page text cache directory")
+    parser.add_argument('--no-cache', action='store_true', help="Always re-extract page text")
+    args = parser.parse_args()
+
+    layouts = dict(MENU_LAYOUTS)
+    if args.layouts:
+        with open(args.layouts, encoding='utf-8') as f:
+            layouts.update(json.load(f))
+    if args.only:
+        layouts = {name: layouts[name] for name in args.only}
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    menu_df = extract_menus(layouts, base_dir, args.workers,
+                            None if args.no_cache else args.cache_dir)
+
+    print(f"✅ Extracted {len(menu_df)} dishes from {len(layouts)} menus")
+    for restaurant, group in menu_df.groupby('Restaurant', sort=False):
+        print(f"🍽️  {restaurant}: {len(group)} dishes in {group['Dish Category'].nunique()} categories")
+
+    menu_df.to_csv(args.output, index=False, encoding='utf-8')
+    print(f"📄 Output file: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
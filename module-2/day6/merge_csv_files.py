@@ -1,46 +1,178 @@
 #!/usr/bin/env python3
 """
-Merge the two restaurant CSV files into a single combined file.
+Merge restaurant menu CSV files into a single combined file.
+
+Any number of inputs (files or glob patterns) are streamed in chunks:
+column names are aligned to one schema, rows are deduplicated on
+(Restaurant, ID) and written straight to the output, so memory holds one
+chunk plus the keys seen so far rather than the whole dataset.
+
+Usage:
+    python merge_csv_files.py                                   # La Fonte + Zeughauskeller
+    python merge_csv_files.py "menus/*.csv" --output all_menus.csv --chunksize 50000
 """
+import argparse
+import glob
+import os
+from collections import Counter
+from typing import Dict, Iterable, List
+
 import pandas as pd
 
-def merge_restaurant_csvs():
-    """Merge La Fonte and Zeughauskeller CSV files into one combined file."""
-    
-    # Read both CSV files
-    la_fonte_df = pd.read_csv('la_fonte_menu_dishes.csv')
-    zeughauskeller_df = pd.read_csv('zeughauskeller_menu_dishes.csv')
-    
-    # Combine the DataFrames
-    combined_df = pd.concat([la_fonte_df, zeughauskeller_df], ignore_index=True)
-    
-    # Save the merged file
-    output_file = 'combined_restaurant_menus.csv'
-    combined_df.to_csv(output_file, index=False)
-    
+MENU_COLUMNS = ['Restaurant', 'ID', 'Dish', 'Dish Category', 'Ingredients', 'Price']
+
+# Alternative spellings seen in menu exports -> canonical column
+COLUMN_ALIASES = {
+    'restaurant name': 'Restaurant',
+    'dish id': 'ID',
+    'dish name': 'Dish',
+    'category': 'Dish Category',
+    'ingredient list': 'Ingredients',
+    'price (chf)': 'Price'
+}
+
+
+def canonical_column(name: str) -> str:
+    """Map a header to its canonical spelling (case and whitespace insensitive)"""
+    key = ' '.join(str(name).split()).lower()
+    for column in MENU_COLUMNS:
+        if column.lower() == key:
+            return column
+    return COLUMN_ALIASES.get(key, ' '.join(str(name).split()))
+
+
+def expand_inputs(patterns: Iterable[str], exclude: Iterable[str] = ()) -> List[str]:
+    """
+    Files matching the patterns, in the order given (sorted within a glob)
+    Paths in exclude (e.g. the output file, which a glob may match) are left out.
+    """
+    excluded = {os.path.realpath(path) for path in exclude}
+    files = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) or [pattern]
+        files.extend(path for path in matches
+                     if path not in files and os.path.realpath(path) not in excluded)
+    return files
+
+
+def combine_duplicate_columns(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Merge columns that share a canonical name (e.g. 'Dish Name' and 'Dish')
+    Per row the first non-empty value, in header order, is kept.
+    """
+    if not chunk.columns.duplicated().any():
+        return chunk
+    combined = {}
+    for name in dict.fromkeys(chunk.columns):
+        block = chunk.loc[:, chunk.columns == name]
+        column = block.iloc[:, 0]
+        for position in range(1, block.shape[1]):
+            column = column.where(column != '', block.iloc[:, position])
+        combined[name] = column
+    return pd.DataFrame(combined, index=chunk.index)
+
+
+def unified_schema(files: List[str]) -> List[str]:
+    """Canonical menu columns first, then any extra columns in first-seen order"""
+    columns = list(MENU_COLUMNS)
+    for path in files:
+        for name in pd.read_csv(path, nrows=0).columns:
+            column = canonical_column(name)
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+def merge_menu_csvs(inputs: Iterable[str], output_file: str, chunksize: int = 10000,
+                    key: tuple = ('Restaurant', 'ID')) -> Dict:
+    """
+    Stream-merge menu CSVs into output_file, keeping the first row per key
+    Values are copied as text, so nothing is reformatted on the way through.
+    Each chunk is deduplicated with drop_duplicates() on its key columns, and
+    only the chunk's unique keys are checked against a running set of value
+    tuples (one entry per unique dish), so rows only count as duplicates when
+    their key values are equal. Rows without a value in the first key column (e.g. a file with no
+    Restaurant column) use their source file there instead; rows missing any
+    other key value (e.g. an empty ID) are keyed on the whole row, so only
+    identical rows collapse.
+    """
+    files = expand_inputs(inputs, exclude=[output_file])
+    columns = unified_schema(files)
+    seen = set()
+    stats = {'files': len(files), 'rows_read': 0, 'rows_written': 0, 'duplicates': 0,
+             'restaurants': Counter()}
+
+    with open(output_file, 'w', encoding='utf-8', newline='') as out:
+        pd.DataFrame(columns=columns).to_csv(out, index=False)
+        for path in files:
+            reader = pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunksize)
+            for chunk in reader:
+                chunk = combine_duplicate_columns(chunk.rename(columns=canonical_column))
+                chunk = chunk.reindex(columns=columns, fill_value='')
+                keys = chunk[list(key)].copy()
+                keys[key[0]] = keys[key[0]].mask(keys[key[0]] == '', path)
+                # Rows missing another key value carry their whole row in the key
+                incomplete = (keys.iloc[:, 1:] == '').any(axis=1)
+                rest = chunk.loc[incomplete, [column for column in columns if column not in key]]
+                rows = pd.Series(list(zip(*(rest[column].tolist() for column in rest.columns))),
+                                 index=rest.index, dtype=object)
+                keys['row'] = rows.reindex(chunk.index, fill_value='')
+
+                # Vectorized dedupe within the chunk, then only its unique keys hit the set
+                unique = keys.drop_duplicates()
+                unique_keys = list(zip(*(unique[column].tolist() for column in unique.columns)))
+                new = [row_key not in seen for row_key in unique_keys]
+                seen.update(unique_keys)
+                keep = pd.Series(chunk.index.isin(unique.index[new]), index=chunk.index)
+
+                stats['rows_read'] += len(chunk)
+                stats['rows_written'] += int(keep.sum())
+                stats['duplicates'] += int((~keep).sum())
+                stats['restaurants'].update(chunk.loc[keep, 'Restaurant'].value_counts().to_dict())
+                chunk[keep].to_csv(out, header=False, index=False)
+    return stats
+
+
+def merge_restaurant_csvs(inputs: Iterable[str] = ('la_fonte_menu_dishes.csv',
+                                                   'zeughauskeller_menu_dishes.csv'),
+                          output_file: str = 'combined_restaurant_menus.csv',
+                          chunksize: int = 10000):
+    """Merge restaurant menu CSV files into one combined file."""
+    stats = merge_menu_csvs(inputs, output_file, chunksize)
+
     print(f"✅ Successfully merged restaurant menu files!")
     print(f"📄 Output file: {output_file}")
-    print(f"📊 Total dishes: {len(combined_df)}")
-    print(f"🍽️  La Fonte dishes: {len(la_fonte_df)}")
-    print(f"🍽️  Zeughauskeller dishes: {len(zeughauskeller_df)}")
-    
+    print(f"📂 Input files: {stats['files']}")
+    print(f"📊 Total dishes: {stats['rows_written']}")
+    print(f"🔁 Duplicates skipped: {stats['duplicates']}")
+
     # Show summary by restaurant
     print("\n" + "="*60)
     print("COMBINED MENU SUMMARY")
     print("="*60)
-    restaurant_counts = combined_df['Restaurant'].value_counts()
-    for restaurant, count in restaurant_counts.items():
+    for restaurant, count in stats['restaurants'].most_common():
         print(f"{restaurant}: {count} dishes")
-    
+
     # Show first few rows as preview
     print("\n" + "="*60)
     print("PREVIEW OF MERGED DATA")
     print("="*60)
-    print(combined_df.head(3).to_string(index=False))
+    print(pd.read_csv(output_file, nrows=3).to_string(index=False))
     print("...")
-    print(combined_df.tail(3).to_string(index=False))
-    
+
     return output_file
 
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge restaurant menu CSV files")
+    parser.add_argument('inputs', nargs='*',
+                        default=['la_fonte_menu_dishes.csv', 'zeughauskeller_menu_dishes.csv'],
+                        help="Menu CSV files or glob patterns")
+    parser.add_argument('--output', default='combined_restaurant_menus.csv')
+    parser.add_argument('--chunksize', type=int, default=10000, help="Rows read per chunk")
+    args = parser.parse_args()
+    merge_restaurant_csvs(args.inputs, args.output, args.chunksize)
+
+
 if __name__ == "__main__":
-    merge_restaurant_csvs()
\ No newline at end of file
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Page text cache - content-addressed cache of per-page PDF extraction.
+
+Each page's text and layout tokens (lines with font, size and position)
+are stored under the SHA-256 of the PDF's bytes and the page number, so a
+renamed or copied PDF still hits the cache and an edited PDF never does.
+Re-running extraction over a PDF collection only touches pages that have
+never been seen before.
+
+Usage:
+    python page_cache.py 01_lafonterestaurantpizzeria_speisekarte.pdf --pages 1-3
+    python page_cache.py 01_Zeughauskeller_Menu.pdf --pages 2 --output page_2.txt
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from collections import Counter
+from typing import Dict, List, Optional
+
+import pdfplumber
+
+from digests import file_digest
+
+# Bump when the extraction below changes, so stale entries are ignored
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.page_cache')
+
+
+def extract_page(page) -> Dict:
+    """Text and layout tokens of a pdfplumber page"""
+    lines = []
+    for line in page.extract_text_lines(return_chars=True):
+        fonts = Counter(
+            (char['fontname'].split('+')[-1], round(char['size'], 1))
+            for char in line['chars'] if char['text'].strip()
+        )
+        if not fonts:
+            continue
+        (font, size), _ = fonts.most_common(1)[0]
+        lines.append({'text': line['text'].strip(), 'font': font, 'size': size,
+                      'x0': round(line['x0'], 1), 'top': round(line['top'], 1)})
+    return {'text': page.extract_text() or '', 'lines': lines}
+
+
+class PageCache:
+    """
+    On-disk cache of extract_page() results keyed by PDF hash and page number
+    Entries are written atomically, so parallel workers can share one cache.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, digest: str, page_number: int) -> str:
+        return os.path.join(self.cache_dir, f"v{CACHE_VERSION}", digest[:2], digest,
+                            f"page_{page_number:04d}.json")
+
+    def get(self, digest: str, page_number: int) -> Optional[Dict]:
+        try:
+            with open(self._path(digest, page_number), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, digest: str, page_number: int, entry: Dict):
+        path = self._path(digest, page_number)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def pages(self, pdf_path: str, page_numbers: List[int]) -> List[Dict]:
+        """Entries for 1-based page numbers; the PDF is only opened on a miss"""
+        digest = file_digest(pdf_path)
+        entries = {page: self.get(digest, page) for page in page_numbers}
+        missing = [page for page, entry in entries.items() if entry is None]
+        self.hits += len(page_numbers) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            with pdfplumber.open(pdf_path) as pdf:
+                for page in missing:
+                    entries[page] = extract_page(pdf.pages[page - 1])
+                    self.put(digest, page, entries[page])
+        return [entries[page] for page in page_numbers]
+
+    def page(self, pdf_path: str, page_number: int) -> Dict:
+        return self.pages(pdf_path, [page_number])[0]
+
+
+def parse_pages(spec: str) -> List[int]:
+    """'2,5-7' -> [2, 5, 6, 7]"""
+    pages = []
+    for part in spec.split(','):
+        start, _, end = part.partition('-')
+        pages.extend(range(int(start), int(end or start) + 1))
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract PDF page text through the page cache")
+    parser.add_argument('pdf')
+    parser.add_argument('--pages', help="Pages to extract, e.g. '15-18' or '2,4' (default: all)")
+    parser.add_argument('--output', help="Write the text here instead of printing it")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = parse_pages(args.pages)
+    else:
+        with pdfplumber.open(args.pdf) as pdf:
+            pages = list(range(1, len(pdf.pages) + 1))
+
+    cache = PageCache(args.cache_dir)
+    text = '\n'.join(entry['text'] for entry in cache.pages(args.pdf, pages))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"📄 {len(pages)} pages written to {args.output}")
+    else:
+        print(text)
+    # Keep stdout to the page text, so it can be piped or redirected
+    print(f"🗂️  Page cache: {cache.hits} hits, {cache.misses} extracted", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,6 @@
 Perform PCA dimensionality reduction on COGS attributes and create a scatter plot
 with non-overlapping dish name labels.
 """
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.decomposition import PCA
@@ -11,11 +10,13 @@ from sklearn.preprocessing import StandardScaler
 from adjustText import adjust_text
 import seaborn as sns
 
+from dataset_store import load_table
+
 def perform_pca_analysis():
     """Perform PCA on COGS attributes and create visualization."""
     
     # Load the data
-    df = pd.read_csv('zeughauskeller-cogs.csv')
+    df = load_table('zeughauskeller_cogs', columns=['Dish Name', 'COGS_*'])
     
     # Select COGS attributes (columns starting with "COGS_")
     cogs_columns = [col for col in df.columns if col.startswith('COGS_')]
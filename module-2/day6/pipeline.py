@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Pipeline runner - rerun only the day6 stages whose inputs changed.
+
+Each stage is one script with declared input and output files; stages are
+linked by those files (the merge stage writes combined_restaurant_menus.csv,
+which the dataset store reads, ...). A stage's fingerprint is the SHA-256
+of its inputs, its script and the local modules the script imports, and it
+is skipped while the fingerprint and its outputs match the last run.
+
+Because fingerprints cover file contents, not timestamps, a stage that is
+rerun but writes identical outputs does not invalidate what follows it.
+Independent stages run in parallel.
+
+Usage:
+    python pipeline.py                        # run everything that is stale
+    python pipeline.py clustering pca         # these stages and what they need
+    python pipeline.py --dry-run
+    python pipeline.py --force --jobs 4
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from graphlib import TopologicalSorter
+from typing import Dict, Iterable, List, Optional, Set
+
+from dataset_store import BASE_DIR, TABLES, table_path
+from digests import file_digest
+
+# Bump when fingerprints change meaning, so every stage reruns once
+PIPELINE_VERSION = 1
+DEFAULT_STATE_DIR = os.path.join(BASE_DIR, '.pipeline')
+
+
+def _store(name: str) -> str:
+    return os.path.relpath(table_path(name), BASE_DIR)
+
+
+STAGES = {
+    'la_fonte_menu': {'script': 'menu_dishes_extract.py', 'inputs': [],
+                      'outputs': ['la_fonte_menu_dishes.csv']},
+    'zeughauskeller_menu': {'script': 'zeughauskeller_extract.py', 'inputs': [],
+                            'outputs': ['zeughauskeller_menu_dishes.csv']},
+    'pdf_menus': {'script': 'menu_extractor.py',
+                  'inputs': ['01_lafonterestaurantpizzeria_speisekarte.pdf', '01_Zeughauskeller_Menu.pdf'],
+                  'outputs': ['extracted_restaurant_menus.csv']},
+    'merge': {'script': 'merge_csv_files.py',
+              'inputs': ['la_fonte_menu_dishes.csv', 'zeughauskeller_menu_dishes.csv'],
+              'outputs': ['combined_restaurant_menus.csv']},
+    'dataset_store': {'script': 'dataset_store.py',
+                      'inputs': [spec['source'] for spec in TABLES.values()],
+                      'outputs': [_store(name) for name in TABLES]},
+    'correlation': {'script': 'cogs_price_correlation.py', 'inputs': [_store('zeughauskeller_cogs')],
+                    'outputs': ['cogs_price_correlation_matrix.png', 'cogs_price_correlation_results.csv']},
+    'clustering': {'script': 'clustering_analysis.py', 'inputs': [_store('zeughauskeller_cogs')],
+                   'outputs': ['zeughauskeller_clustering_analysis.png', 'zeughauskeller_clustering_results.csv']},
+    'pca': {'script': 'pca_analysis.py', 'inputs': [_store('zeughauskeller_cogs')],
+            'outputs': ['zeughauskeller_pca_analysis.png', 'zeughauskeller_pca_loadings.png']},
+    'classification': {'script': 'healthiness_classification.py', 'inputs': [_store('zeughauskeller_cogs')],
+                       'outputs': ['healthiness_classification_analysis.png',
+                                   'healthiness_classification_results.csv']},
+    'beef_steak': {'script': 'predict_beef_steak.py',
+                   'inputs': [_store('zeughauskeller_cogs'), _store('la_fonte_cogs')],
+                   'outputs': ['beef_steak_healthiness_prediction.png']},
+    'shap': {'script': 'shap_beef_steak_analysis.py', 'inputs': [_store('zeughauskeller_cogs')],
+             'outputs': ['beef_steak_shap_analysis.png']},
+    'healthiness_cost': {'script': 'healthiness_cost_analysis.py', 'inputs': ['combined_restaurant_menus.csv'],
+                         'outputs': ['healthiness_cost_correlation_analysis.png']},
+    'price_kde': {'script': 'price_kde_comparison.py',
+                  'inputs': ['la_fonte_menu_dishes.csv', 'zeughauskeller_menu_dishes.csv'],
+                  'outputs': ['restaurant_price_kde_comparison.png']},
+    'pie_charts': {'script': 'ingredient_pie_charts.py',
+                   'inputs': ['la_fonte_menu_dishes.csv', 'zeughauskeller_menu_dishes.csv'],
+                   'outputs': ['restaurant_ingredient_pie_charts.png']}
+}
+
+
+def local_modules(script: str) -> List[str]:
+    """The script and every module of this directory it imports, directly or not"""
+    found: Set[str] = set()
+    pending = [script]
+    while pending:
+        path = pending.pop()
+        if path in found:
+            continue
+        found.add(path)
+        with open(os.path.join(BASE_DIR, path), encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                module = f"{name.split('.')[0]}.py"
+                if os.path.exists(os.path.join(BASE_DIR, module)):
+                    pending.append(module)
+    return sorted(found)
+
+
+def stage_dependencies(stages: Dict[str, Dict] = STAGES) -> Dict[str, Set[str]]:
+    """Stage -> stages producing its inputs"""
+    producers: Dict[str, str] = {}
+    for name, stage in stages.items():
+        for output in stage['outputs']:
+            if output in producers:
+                raise ValueError(f"{output} is written by both {producers[output]} and {name}")
+            producers[output] = name
+    return {name: {producers[path] for path in stage['inputs'] if path in producers}
+            for name, stage in stages.items()}
+
+
+def stage_fingerprint(stage: Dict) -> str:
+    """SHA-256 over the stage's arguments and the contents of its inputs and code"""
+    files = {}
+    for path in [*stage['inputs'], *local_modules(stage['script'])]:
+        full = os.path.join(BASE_DIR, path)
+        files[path] = file_digest(full) if os.path.exists(full) else None
+    payload = {'version': PIPELINE_VERSION, 'args': stage.get('args', []), 'files': files}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class PipelineState:
+    """Fingerprints and output digests of the last successful run of each stage"""
+
+    def __init__(self, state_dir: str = DEFAULT_STATE_DIR):
+        self.state_dir = state_dir
+        self.path = os.path.join(state_dir, 'state.json')
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.stages = json.load(f)
+        except (OSError, ValueError):
+            self.stages = {}
+
+    def is_current(self, name: str, fingerprint: str) -> bool:
+        """Same inputs as last time and the outputs untouched since"""
+        recorded = self.stages.get(name)
+        if not recorded or recorded['fingerprint'] != fingerprint:
+            return False
+        for path, digest in recorded['outputs'].items():
+            full = os.path.join(BASE_DIR, path)
+            if not os.path.exists(full) or file_digest(full) != digest:
+                return False
+        return True
+
+    def record(self, name: str, fingerprint: str, outputs: Iterable[str], seconds: float):
+        self.stages[name] = {'fingerprint': fingerprint, 'seconds': round(seconds, 2),
+                             'outputs': {path: file_digest(os.path.join(BASE_DIR, path)) for path in outputs}}
+        os.makedirs(self.state_dir, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.stages, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def run_stage(name: str, stage: Dict, log_dir: str) -> Dict:
+    """Run one stage's script (non-interactive plotting); its output goes to a log file"""
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.join(log_dir, f"{name}.log")
+    start = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        process = subprocess.run([sys.executable, stage['script'], *stage.get('args', [])],
+                                 cwd=BASE_DIR, stdout=log, stderr=subprocess.STDOUT,
+                                 env={**os.environ, 'MPLBACKEND': 'Agg'})
+    missing = [path for path in stage['outputs'] if not os.path.exists(os.path.join(BASE_DIR, path))]
+    error = None
+    if process.returncode != 0:
+        error = f"exit code {process.returncode}"
+    elif missing:
+        error = f"did not write {', '.join(missing)}"
+    return {'error': error, 'log': log_path, 'seconds': time.perf_counter() - start}
+
+
+def select_stages(targets: Optional[Iterable[str]], dependencies: Dict[str, Set[str]]) -> Set[str]:
+    """The target stages and everything upstream of them (all stages if no targets)"""
+    if not targets:
+        return set(dependencies)
+    selected: Set[str] = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in dependencies:
+            raise SystemExit(f"Unknown stage: {name} (choose from {', '.join(dependencies)})")
+        if name not in selected:
+            selected.add(name)
+            pending.extend(dependencies[name])
+    return selected
+
+
+def run_pipeline(targets: Optional[Iterable[str]] = None, jobs: Optional[int] = None,
+                 force: bool = False, state_dir: str = DEFAULT_STATE_DIR,
+                 stages: Dict[str, Dict] = STAGES) -> Dict[str, str]:
+    """
+    Run stale stages in dependency order, up to jobs at a time
+    Returns stage -> 'ran', 'current', 'failed' or 'blocked' (an upstream failed).
+    """
+    dependencies = stage_dependencies(stages)
+    selected = select_stages(targets, dependencies)
+    state = PipelineState(state_dir)
+    log_dir = os.path.join(state_dir, 'logs')
+    status: Dict[str, str] = {}
+
+    sorter = TopologicalSorter(dependencies)
+    sorter.prepare()
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        running = {}
+        while sorter.is_active():
+            for name in sorter.get_ready():
+                if name not in selected:
+                    sorter.done(name)
+                elif any(status.get(dep) in ('failed', 'blocked') for dep in dependencies[name]):
+                    status[name] = 'blocked'
+                    print(f"⛔ {name}: skipped, an upstream stage failed")
+                    sorter.done(name)
+                else:
+                    # Upstream stages are finished, so their outputs are final here
+                    fingerprint = stage_fingerprint(stages[name])
+                    if not force and state.is_current(name, fingerprint):
+                        status[name] = 'current'
+                        print(f"⏭️  {name}: up to date")
+                        sorter.done(name)
+                    else:
+                        print(f"▶️  {name}: running {stages[name]['script']}")
+                        running[pool.submit(run_stage, name, stages[name], log_dir)] = (name, fingerprint)
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, fingerprint = running.pop(future)
+                result = future.result()
+                if result['error']:
+                    status[name] = 'failed'
+                    print(f"❌ {name}: {result['error']} (log: {os.path.relpath(result['log'])})")
+                else:
+                    status[name] = 'ran'
+                    state.record(name, fingerprint, stages[name]['outputs'], result['seconds'])
+                    print(f"✅ {name}: done in {result['seconds']:.1f}s")
+                sorter.done(name)
+    return status
+
+
+def stale_stages(targets: Optional[Iterable[str]] = None, state_dir: str = DEFAULT_STATE_DIR,
+                 stages: Dict[str, Dict] = STAGES) -> List[str]:
+    """Stages a run would execute (assuming every rerun changes its outputs)"""
+    dependencies = stage_dependencies(stages)
+    selected = select_stages(targets, dependencies)
+    state = PipelineState(state_dir)
+    stale: List[str] = []
+    for name in TopologicalSorter(dependencies).static_order():
+        if name in selected and (dependencies[name] & set(stale)
+                                 or not state.is_current(name, stage_fingerprint(stages[name]))):
+            stale.append(name)
+    return stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the day6 analysis pipeline incrementally")
+    parser.add_argument('targets', nargs='*', help="Stages to bring up to date (default: all)")
+    parser.add_argument('--jobs', type=int, help="Stages run in parallel (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="Rerun stages even if up to date")
+    parser.add_argument('--dry-run', action='store_true', help="Only list the stages that would run")
+    parser.add_argument('--list', action='store_true', help="Show the stages and their inputs")
+    parser.add_argument('--state-dir', default=DEFAULT_STATE_DIR)
+    args = parser.parse_args()
+
+    if args.list:
+        for name, deps in stage_dependencies().items():
+            after = f" (after {', '.join(sorted(deps))})" if deps else ''
+            print(f"📋 {name:<20} {STAGES[name]['script']}{after}")
+        return
+
+    if args.dry_run:
+        stale = stale_stages(args.targets, args.state_dir)
+        print(f"🔍 {len(stale)} stage(s) would run: {', '.join(stale) or 'none'}")
+        return
+
+    start = time.perf_counter()
+    status = run_pipeline(args.targets, args.jobs, args.force, args.state_dir)
+    counts = {key: list(status.values()).count(key) for key in ('ran', 'current', 'failed', 'blocked')}
+    print(f"\n🏁 {counts['ran']} ran, {counts['current']} up to date, {counts['failed']} failed, "
+          f"{counts['blocked']} blocked in {time.perf_counter() - start:.1f}s")
+    if counts['failed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,29 +8,18 @@ import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.preprocessing import StandardScaler
 from sklearn.linear_model import LogisticRegression
-import re
 
-def extract_numeric_price(price_str):
-    """Extract numeric price from price string."""
-    if pd.isna(price_str):
-        return None
-    
-    numbers = re.findall(r'\d+\.?\d*', str(price_str))
-    if numbers:
-        prices = [float(num) for num in numbers]
-        return sum(prices) / len(prices)
-    return None
+from dataset_store import load_table
+from dish_similarity import DishSimilarityIndex, align_cogs, load_cogs_catalogue
 
 def predict_beef_steak_healthiness():
     """Add new Beef Steak dish and predict its healthiness."""
     
     # Load the original dataset
-    df = pd.read_csv('zeughauskeller-cogs.csv')
+    df = load_table('zeughauskeller_cogs', columns=['Dish Name', 'COGS_*', 'Estimated dish weight (kg)', 'Price_Numeric',
+                                                     'Total COGS Estimated (CHF)', 'Healthiness'])
     print(f"📊 Original dataset: {len(df)} dishes")
     
-    # Extract numeric price
-    df['Price_Numeric'] = df['Price (CHF)'].apply(extract_numeric_price)
-    
     # Select features
     cogs_columns = [col for col in df.columns if col.startswith('COGS_')]
     feature_columns = cogs_columns + ['Estimated dish weight (kg)', 'Price_Numeric', 'Total COGS Estimated (CHF)']
@@ -169,16 +158,15 @@ def predict_beef_steak_healthiness():
     print(f"\n📋 COMPARISON WITH SIMILAR DISHES:")
     print("-" * 60)
     
-    # Find dishes with similar characteristics
-    meat_dishes = df[df['COGS_Meat/Sausage (CHF)'] > 10.0].copy()
-    if len(meat_dishes) > 0:
-        print(f"High-meat dishes (>10 CHF meat cost) in dataset:")
-        for _, dish in meat_dishes.iterrows():
-            dish_name = dish['Dish Name']
-            meat_cost = dish['COGS_Meat/Sausage (CHF)']
-            healthiness = dish['Healthiness']
-            price = dish.get('Price_Numeric', 'N/A')
-            print(f"  • {dish_name}: Meat={meat_cost} CHF, Health={healthiness}, Price={price} CHF")
+    # Find dishes with similar characteristics (nearest neighbours by COGS profile)
+    catalogue = load_cogs_catalogue()
+    similar = DishSimilarityIndex(catalogue).query(align_cogs(pd.DataFrame([beef_steak])), k=5)
+    print(f"Most similar dishes by COGS profile (all restaurants):")
+    for _, hit in similar.iterrows():
+        dish = catalogue.iloc[hit['Position']]
+        print(f"  • {hit['Dish Name']} ({hit['Restaurant']}): Meat={dish['COGS_Meat']:.1f} CHF, "
+              f"Health={dish['Healthiness']}, Price={dish['Price_Numeric']:.1f} CHF, "
+              f"Distance={hit['Distance']:.2f}")
     
     # Statistical context
     print(f"\n📈 STATISTICAL CONTEXT:")
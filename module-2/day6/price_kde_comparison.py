@@ -4,51 +4,40 @@ Create a kernel density estimation (KDE) plot comparing dish price distributions
 between Zeughauskeller (orange) and La Fonte (blue)
 """
 
+import os
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-import re
 
-def extract_price_values(price_str):
-    """Extract numeric price values from price strings"""
-    if pd.isna(price_str):
-        return np.nan
-    
-    # Extract all numbers from the price string
-    numbers = re.findall(r'\d+\.?\d*', str(price_str))
-    if not numbers:
-        return np.nan
-    
-    # Convert to float and take the first (or average) price
-    prices = [float(num) for num in numbers]
-    
-    # Handle special cases like ranges (Klein/Groß) or sharing dishes
-    if len(prices) == 1:
-        return prices[0]
-    elif len(prices) == 2:
-        # For dishes with two prices (like Klein/Groß), take the average
-        return np.mean(prices)
-    else:
-        # For multiple prices, take the first one
-        return prices[0]
+from price_parser import parse_prices, price_variants
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def kde_prices(prices):
+    """
+    One price per dish: the mean of two size variants (Klein/Groß), otherwise
+    the first amount, so dishes with three or more prices keep their first one
+    """
+    parsed = parse_prices(prices)
+    first = price_variants(prices)['Amount'].groupby(level=0).first().reindex(prices.index)
+    return parsed['Price_Numeric'].where(parsed['Price_Variants'] <= 2, first)
 
 def load_and_process_data():
     """Load both restaurant datasets and process price data"""
     
     # Load La Fonte data
-    la_fonte_df = pd.read_csv('/workspaces/cas-uzh/module-2/day6/la_fonte_menu_dishes.csv')
+    la_fonte_df = pd.read_csv(os.path.join(BASE_DIR, 'la_fonte_menu_dishes.csv'))
     la_fonte_df['Restaurant_Clean'] = 'La Fonte'
     
     # Load Zeughauskeller data
-    zeughaus_df = pd.read_csv('/workspaces/cas-uzh/module-2/day6/zeughauskeller_menu_dishes.csv')
+    zeughaus_df = pd.read_csv(os.path.join(BASE_DIR, 'zeughauskeller_menu_dishes.csv'))
     zeughaus_df['Restaurant_Clean'] = 'Zeughauskeller'
     
     # Combine datasets
     combined_df = pd.concat([la_fonte_df, zeughaus_df], ignore_index=True)
     
     # Extract numeric prices
-    combined_df['Price_Numeric'] = combined_df['Price'].apply(extract_price_values)
+    combined_df['Price_Numeric'] = kde_prices(combined_df['Price'])
     
     # Remove rows with missing or extreme prices (sharing dishes)
     combined_df = combined_df.dropna(subset=['Price_Numeric'])
@@ -204,7 +193,7 @@ def main():
     fig = create_kde_plot(data)
     
     # Save plot
-    output_path = '/workspaces/cas-uzh/module-2/day6/restaurant_price_kde_comparison.png'
+    output_path = os.path.join(BASE_DIR, 'restaurant_price_kde_comparison.png')
     fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
     print(f"KDE plot saved to: {output_path}")
     
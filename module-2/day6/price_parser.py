@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Price parser - structured prices from menu price text.
+
+    '14.00 CHF (Klein) / 18.00 CHF (Groß)'
+        -> min 14.0, max 18.0, mean 16.0, 2 variants, 'Klein / Groß', CHF
+    '88.00 CHF (for 2 persons)'
+        -> 88.0 (numbers inside a variant label are not prices)
+
+A whole column is parsed with one pandas string extraction over its
+distinct values; the parsed values of recent columns are kept in an LRU
+cache, so repeated loads of the same menus only look up rows.
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+import pandas as pd
+
+# An amount with an optional currency before or after it and an optional
+# '(label)' naming the size or portion variant
+PRICE_PATTERN = (r'(?:(?P<prefix>CHF|EUR|€|Fr\.)\s*)?'
+                 r'(?P<amount>\d+(?:[.,]\d+)?)'
+                 r'\s*(?P<currency>CHF|EUR|€|Fr\.)?'
+                 r'\s*(?:\((?P<label>[^)]*)\))?')
+CURRENCY_CODES = {'CHF': 'CHF', 'Fr.': 'CHF', 'EUR': 'EUR', '€': 'EUR'}
+PRICE_COLUMNS = ['Price_Min', 'Price_Max', 'Price_Numeric', 'Price_Variants',
+                 'Price_Labels', 'Currency']
+# Distinct price columns whose parsed values are kept
+PARSED_CACHE_SIZE = 64
+
+
+def price_variants(prices: pd.Series, default_currency: str = 'CHF') -> pd.DataFrame:
+    """
+    One row per price variant, indexed by (row, variant)
+    Columns: Amount, Label ('' when unlabelled), Currency. When a text has
+    amounts with a currency, bare numbers in it are ignored.
+    """
+    parts = prices.astype('string').str.extractall(PRICE_PATTERN)
+    currency = parts['currency'].fillna(parts['prefix'])
+    has_currency = currency.notna()
+    any_currency = has_currency.groupby(level=0).transform('any')
+    parts, currency = parts[has_currency | ~any_currency], currency[has_currency | ~any_currency]
+    return pd.DataFrame({
+        'Amount': parts['amount'].str.replace(',', '.', regex=False).astype(float),
+        'Label': parts['label'].fillna('').str.strip(),
+        'Currency': currency.map(CURRENCY_CODES).fillna(default_currency)
+    }, index=parts.index)
+
+
+def _summarize(texts: pd.Series, default_currency: str) -> pd.DataFrame:
+    """PRICE_COLUMNS for each text (rows without an amount are left out)"""
+    variants = price_variants(texts, default_currency)
+    amounts = variants['Amount'].groupby(level=0)
+    labels = variants.loc[variants['Label'] != '', 'Label']
+    return pd.DataFrame({
+        'Price_Min': amounts.min(),
+        'Price_Max': amounts.max(),
+        'Price_Numeric': amounts.mean(),
+        'Price_Variants': amounts.size(),
+        'Price_Labels': labels.groupby(level=0).agg(' / '.join),
+        'Currency': variants['Currency'].groupby(level=0).first()
+    }, columns=PRICE_COLUMNS)
+
+
+@lru_cache(maxsize=PARSED_CACHE_SIZE)
+def _parsed_table(texts: Tuple[str, ...], default_currency: str) -> pd.DataFrame:
+    """PRICE_COLUMNS for each distinct text, in order (not to be modified: it is cached)"""
+    table = _summarize(pd.Series(texts, dtype=object), default_currency).reindex(range(len(texts)))
+    table['Price_Variants'] = table['Price_Variants'].fillna(0).astype(int)
+    table['Price_Labels'] = table['Price_Labels'].fillna('').astype(str)
+    return table
+
+
+def parse_prices(prices: pd.Series, default_currency: str = 'CHF') -> pd.DataFrame:
+    """
+    Structured prices for a column of price text (or plain numbers)
+    Returns PRICE_COLUMNS aligned with prices.index: min, max and mean
+    amount, number of variants, their labels joined with ' / ' and the
+    currency. Texts without any amount give NaN prices and 0 variants.
+    """
+    codes, uniques = pd.factorize(prices.astype('string'))
+    table = _parsed_table(tuple(str(text) for text in uniques), default_currency)
+    # Missing prices (code -1) become empty rows
+    parsed = table.reindex(codes).set_axis(prices.index)
+    parsed['Price_Variants'] = parsed['Price_Variants'].fillna(0).astype(int)
+    parsed['Price_Labels'] = parsed['Price_Labels'].fillna('')
+    for column in ('Price_Min', 'Price_Max', 'Price_Numeric'):
+        parsed[column] = parsed[column].astype(float)
+    return parsed
+
+
+if __name__ == "__main__":
+    menus = pd.read_csv('combined_restaurant_menus.csv')
+    parsed = parse_prices(menus['Price'])
+    print(pd.concat([menus[['Dish', 'Price']], parsed], axis=1)
+          .drop_duplicates('Price').to_string(index=False))
+    print(f"\n✅ Parsed {len(parsed)} prices, "
+          f"{(parsed['Price_Variants'] > 1).sum()} with size variants")
@@ -9,31 +9,19 @@ import matplotlib.pyplot as plt
 from sklearn.preprocessing import StandardScaler
 from sklearn.linear_model import LogisticRegression
 import shap
-import re
 import warnings
 warnings.filterwarnings('ignore')
 
-def extract_numeric_price(price_str):
-    """Extract numeric price from price string."""
-    if pd.isna(price_str):
-        return None
-    
-    numbers = re.findall(r'\d+\.?\d*', str(price_str))
-    if numbers:
-        prices = [float(num) for num in numbers]
-        return sum(prices) / len(prices)
-    return None
+from dataset_store import load_table
 
 def compute_shap_beef_steak():
     """Compute SHAP values for Beef Steak healthiness prediction."""
     
     # Load the original dataset
-    df = pd.read_csv('zeughauskeller-cogs.csv')
+    df = load_table('zeughauskeller_cogs', columns=['COGS_*', 'Estimated dish weight (kg)', 'Price_Numeric',
+                                                     'Total COGS Estimated (CHF)', 'Healthiness'])
     print(f"📊 Loading dataset: {len(df)} dishes")
     
-    # Extract numeric price
-    df['Price_Numeric'] = df['Price (CHF)'].apply(extract_numeric_price)
-    
     # Select features
     cogs_columns = [col for col in df.columns if col.startswith('COGS_')]
     feature_columns = cogs_columns + ['Estimated dish weight (kg)', 'Price_Numeric', 'Total COGS Estimated (CHF)']
@@ -3,9 +3,12 @@
 Extract 15 dishes from Zeughauskeller menu with balanced sampling
 """
 
+import os
 import pandas as pd
 import re
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 def extract_zeughauskeller_dishes():
     """Extract and structure 15 dishes from the Zeughauskeller menu with balanced sampling"""
     
@@ -188,7 +191,7 @@ def main():
     print(menu_df.to_string(index=False))
     
     # Save to CSV
-    output_file = "/workspaces/cas-uzh/module-2/day6/zeughauskeller_menu_dishes.csv"
+    output_file = os.path.join(BASE_DIR, 'zeughauskeller_menu_dishes.csv')
     menu_df.to_csv(output_file, index=False, encoding='utf-8')
     print(f"\nData saved to: {output_file}")
     